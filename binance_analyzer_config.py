@@ -5,9 +5,33 @@ Binance 分析器配置類別
 """
 
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, List, Tuple, Optional
 
 
+# 候選時間框架預設值（pandas 2.x 頻率別名，'T'/'H' 已棄用）
+DEFAULT_TIMEFRAMES = MappingProxyType({
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "1h": "1h",
+    "4h": "4h",
+    "1d": "1D",
+    "1w": "1W",
+})
+
+# 各時間框架每根 bar 的分鐘數
+TIMEFRAME_MINUTES = MappingProxyType({
+    "1m": 1,
+    "5m": 5,
+    "15m": 15,
+    "1h": 60,
+    "4h": 240,
+    "1d": 1440,
+    "1w": 10080,
+})
+
+
 @dataclass
 class BinanceAnalyzerConfig:
     # 基本設定
@@ -58,15 +82,7 @@ class BinanceAnalyzerConfig:
     def __post_init__(self):
         # 設定時間框架
         if self.timeframes is None:
-            self.timeframes = {
-                "1m": "1T",
-                "5m": "5T", 
-                "15m": "15T",
-                "1h": "1H",
-                "4h": "4H",
-                "1d": "1D",
-                "1w": "1W"
-            }
+            self.timeframes = dict(DEFAULT_TIMEFRAMES)
         
         # 設定各時間框架的最小資料天數要求
         if self.min_days_per_timeframe is None:
@@ -5,14 +5,130 @@ Binance API 工具類
 """
 
 import requests
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+class RateLimiter:
+    """執行緒共用的令牌桶限速器"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """取得一個令牌；令牌不足時預約下一個，並在鎖外等待"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+# K線間隔對應的毫秒數（單次請求最多 1000 根）
+INTERVAL_MS = MappingProxyType({
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+})
+KLINES_PER_REQUEST = 1000
+
+# K線回應欄位
+KLINE_COLUMNS = (
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_asset_volume', 'number_of_trades',
+    'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
+)
+
+# 每分鐘請求權重上限，已用超過 80% 時暫停到下一分鐘
+WEIGHT_LIMIT_1M = 1200
+WEIGHT_BACKOFF_RATIO = 0.8
+
+# limit=1000 的K線請求權重：現貨 /api/v3/klines 為 2，合約 /fapi/v1/klines 為 5
+KLINE_REQUEST_WEIGHT = MappingProxyType({"spot": 2, "futures": 5})
+
+# 各市場的K線限速器，速率由權重上限換算（現貨每秒 10 次、合約每秒 4 次）
+_kline_rate_limiters: Dict[str, RateLimiter] = {}
+_kline_rate_limiters_lock = threading.Lock()
+
+# 每個執行緒各自持有一個 Session，重用 TCP/TLS 連線
+_local = threading.local()
+
+
+def get_session() -> requests.Session:
+    """取得目前執行緒的 HTTP Session"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+def get_kline_rate_limiter(market_type: str) -> RateLimiter:
+    """取得該市場共用的K線限速器（每分鐘權重上限 / 單次請求權重）"""
+    with _kline_rate_limiters_lock:
+        limiter = _kline_rate_limiters.get(market_type)
+        if limiter is None:
+            weight = KLINE_REQUEST_WEIGHT.get(market_type, max(KLINE_REQUEST_WEIGHT.values()))
+            rate = WEIGHT_LIMIT_1M / weight / 60.0
+            limiter = RateLimiter(rate=rate, burst=max(1, int(rate)))
+            _kline_rate_limiters[market_type] = limiter
+        return limiter
+
+
+def throttle_by_used_weight(response: requests.Response) -> None:
+    """依 X-MBX-USED-WEIGHT-1m 標頭在接近權重上限時退避"""
+    used = response.headers.get("X-MBX-USED-WEIGHT-1m")
+    if used is None or int(used) < WEIGHT_LIMIT_1M * WEIGHT_BACKOFF_RATIO:
+        return
+    wait = 60 - time.time() % 60
+    print(f"請求權重已用 {used}/{WEIGHT_LIMIT_1M}，等待 {wait:.1f} 秒...")
+    time.sleep(wait)
+
+
+def klines_to_dataframe(klines: List[List]) -> pd.DataFrame:
+    """將 K線原始列表一次轉成數值陣列，建立以 UTC 時間為索引的 DataFrame"""
+    values = np.array(klines, dtype=np.float64)
+    index = pd.to_datetime(values[:, 0].astype(np.int64), unit='ms', utc=True)
+    df = pd.DataFrame(values[:, 1:], columns=list(KLINE_COLUMNS[1:]),
+                      index=pd.DatetimeIndex(index, name='timestamp'))
+    df['close_time'] = df['close_time'].astype(np.int64)
+    df['number_of_trades'] = df['number_of_trades'].astype(np.int64)
+    return df
+
+
 class BinanceAPI:
     """Binance API 工具類"""
     
+    # exchangeInfo 快取存活時間（秒）
+    EXCHANGE_INFO_TTL = 300.0
+    _exchange_info_cache: Dict[str, Tuple[float, Dict[str, Dict]]] = {}
+    
+    get_session = staticmethod(get_session)
+    klines_to_dataframe = staticmethod(klines_to_dataframe)
+    
     @staticmethod
     def get_klines_url(market_type: str) -> str:
         """根據市場類型返回對應的 K線 API URL"""
@@ -47,33 +163,43 @@ class BinanceAPI:
             "interval": interval,
             "startTime": start_time,
             "endTime": end_time,
-            "limit": 1000
+            "limit": KLINES_PER_REQUEST
         }
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            get_kline_rate_limiter(market_type).acquire()
+            response = get_session().get(url, params=params, timeout=10)
             response.raise_for_status()
+            throttle_by_used_weight(response)
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"抓取資料時發生錯誤: {e}")
             return []
     
     @staticmethod
-    def get_available_symbols(market_type: str) -> List[str]:
-        """獲取可用的交易對列表"""
+    def get_exchange_symbols(market_type: str) -> Dict[str, Dict]:
+        """獲取交易所所有交易對資訊（以交易對名稱索引，依市場類型快取）"""
+        now = time.monotonic()
+        cached = BinanceAPI._exchange_info_cache.get(market_type)
+        if cached is not None and now - cached[0] < BinanceAPI.EXCHANGE_INFO_TTL:
+            return cached[1]
+        
         url = BinanceAPI.get_exchange_info_url(market_type)
+        response = get_session().get(url, timeout=10)
+        response.raise_for_status()
+        data = response.json()
         
+        symbols = {symbol_info['symbol']: symbol_info for symbol_info in data['symbols']}
+        BinanceAPI._exchange_info_cache[market_type] = (now, symbols)
+        return symbols
+    
+    @staticmethod
+    def get_available_symbols(market_type: str) -> List[str]:
+        """獲取可用的交易對列表"""
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            symbols = []
-            for symbol_info in data['symbols']:
-                if symbol_info['status'] == 'TRADING':
-                    symbols.append(symbol_info['symbol'])
-            
-            return symbols
+            symbols = BinanceAPI.get_exchange_symbols(market_type)
+            return [name for name, symbol_info in symbols.items()
+                    if symbol_info['status'] == 'TRADING']
         except Exception as e:
             print(f"獲取交易對列表失敗: {e}")
             return []
@@ -81,18 +207,8 @@ class BinanceAPI:
     @staticmethod
     def get_symbol_info(symbol: str, market_type: str) -> Dict:
         """獲取特定交易對的詳細資訊"""
-        url = BinanceAPI.get_exchange_info_url(market_type)
-        
         try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            for symbol_info in data['symbols']:
-                if symbol_info['symbol'] == symbol:
-                    return symbol_info
-            
-            return {}
+            return BinanceAPI.get_exchange_symbols(market_type).get(symbol, {})
         except Exception as e:
             print(f"獲取交易對資訊失敗: {e}")
             return {}
@@ -104,7 +220,7 @@ class BinanceAPI:
         params = {"symbol": symbol}
         
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = get_session().get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -113,7 +229,7 @@ class BinanceAPI:
     
     @staticmethod
     def fetch_historical_data(symbol: str, market_type: str, days: int, 
-                            interval: str = "1m") -> pd.DataFrame:
+                            interval: str = "1m", max_workers: int = 8) -> pd.DataFrame:
         """抓取指定天數的歷史資料"""
         print(f"開始從 Binance {market_type} 抓取 {symbol} {interval} 資料，共 {days} 天...")
         
@@ -121,46 +237,36 @@ class BinanceAPI:
         end_time = int(time.time() * 1000)
         start_time = end_time - (days * 24 * 60 * 60 * 1000)
         
-        all_data = []
-        current_start = start_time
+        # 預先切分請求區間，每次最多1000根K線（區間長度依 interval 而定）
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"不支援的K線間隔: {interval}")
+        step = KLINES_PER_REQUEST * INTERVAL_MS[interval]
+        windows = [(s, min(s + step, end_time)) for s in range(start_time, end_time, step)]
+        print(f"共 {len(windows)} 個請求區間，以 {max_workers} 個連線並行抓取...")
         
-        while current_start < end_time:
-            current_end = min(current_start + (1000 * 60 * 1000), end_time)
-            
-            print(f"抓取 {datetime.fromtimestamp(current_start/1000)} 到 {datetime.fromtimestamp(current_end/1000)} 的資料...")
-            
-            klines = BinanceAPI.fetch_klines(symbol, market_type, interval, current_start, current_end)
-            
+        # 並行抓取，map 保持區間順序；速率由權重標頭控制
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(
+                lambda w: BinanceAPI.fetch_klines(symbol, market_type, interval, w[0], w[1]),
+                windows))
+        
+        all_data = []
+        for (current_start, current_end), klines in zip(windows, results):
             if not klines:
-                print("警告：此時間範圍沒有資料，跳過...")
-                current_start = current_end
+                print(f"警告：{datetime.fromtimestamp(current_start/1000)} 到 "
+                      f"{datetime.fromtimestamp(current_end/1000)} 沒有資料，跳過...")
                 continue
-            
             all_data.extend(klines)
-            current_start = current_end
-            time.sleep(0.1)  # 避免請求過於頻繁
         
         if not all_data:
             raise ValueError("沒有抓取到任何資料")
         
         # 轉換為 DataFrame
-        df = pd.DataFrame(all_data, columns=[
-            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-        ])
-        
-        # 轉換資料類型
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        for col in ['open', 'high', 'low', 'close', 'volume']:
-            df[col] = df[col].astype(float)
-        
-        # 設定時區
-        df['timestamp'] = df['timestamp'].dt.tz_localize('UTC')
+        df = klines_to_dataframe(all_data)
         
         # 排序並去重
-        df = df.sort_values('timestamp').drop_duplicates(subset=['timestamp'])
-        df = df.set_index('timestamp')
+        df = df.sort_index()
+        df = df[~df.index.duplicated()]
         
         print(f"成功抓取 {len(df)} 根K線資料")
         print(f"資料時間範圍: {df.index.min()} 到 {df.index.max()}")
@@ -181,7 +287,7 @@ class BinanceAPI:
         """獲取熱門交易對列表"""
         try:
             url = BinanceAPI.get_ticker_url(market_type)
-            response = requests.get(url, timeout=10)
+            response = get_session().get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -15,11 +15,113 @@ from typing import Dict, List, Tuple, Optional
 import numpy as np
 import pandas as pd
 
-from binance_analyzer_config import BinanceAnalyzerConfig
+from binance_analyzer_config import BinanceAnalyzerConfig, TIMEFRAME_MINUTES
 from binance_api_utils import BinanceAPI
 
+# 若有安裝 pyarrow 且 pandas >= 1.4，CSV 解析改用 pyarrow 引擎（多執行緒，速度快數倍）
+# 注意：pandas 2.x 起 pyarrow 引擎會直接把時間字串解析成秒精度（datetime64[s]），
+# 之後的重採樣與指標計算都沿用索引本身的時間單位，不假設為奈秒
+try:
+    import pyarrow  # noqa: F401
+    _PANDAS_VERSION = tuple(int(p) for p in pd.__version__.split(".")[:2])
+    CSV_ENGINE = "pyarrow" if _PANDAS_VERSION >= (1, 4) else "c"
+except ImportError:
+    CSV_ENGINE = "c"
+
 warnings.filterwarnings("ignore")
 
+# TXT 報告固定段落：指標解讀指南與詳細指標解釋
+_TXT_INDICATOR_GUIDE = (
+    "📋 指標解讀指南:",
+    "• C/A < 0.25: 成本相對於波動率較低，適合交易",
+    "• VR > 1: 偏趨勢市場，適合趨勢策略",
+    "• VR < 1: 偏均值回歸市場，適合均值回歸策略",
+    "• 半衰期: 建議bar週期約為0.5~1倍半衰期",
+    "• 波動率: 反映市場波動程度",
+    "• 偏度: 正偏度表示右尾較長，負偏度表示左尾較長",
+    "• 峰度: 高峰度表示極端值較多",
+    "• 自相關: 正值表示趨勢性，負值表示均值回歸",
+    "• 市場效率比率: 越接近1表示市場越有效率",
+    "",
+    "📊 詳細指標解釋",
+    "-" * 40,
+    "",
+    "🔍 成本/波動比 (C/A Ratio)",
+    "意義: 衡量交易成本相對於市場波動的比率",
+    "解讀: ",
+    "• C/A < 0.25: 成本相對較低，適合頻繁交易",
+    "• C/A 0.25-0.5: 成本適中，需要謹慎選擇入場點",
+    "• C/A > 0.5: 成本過高，不適合短線交易",
+    "",
+    "🔍 走勢一致性 (Variance Ratio, VR)",
+    "意義: 衡量價格變動的趨勢性強度",
+    "解讀:",
+    "• VR > 1: 價格變動具有趨勢性，適合趨勢跟隨策略",
+    "• VR < 1: 價格變動偏向隨機遊走，適合均值回歸策略",
+    "• VR ≈ 1: 價格變動接近隨機遊走",
+    "",
+    "🔍 訊號半衰期 (Signal Half-Life)",
+    "意義: 衡量價格訊號的持續時間",
+    "解讀:",
+    "• 半衰期越長，訊號越持久，適合較長期的策略",
+    "• 半衰期越短，訊號變化越快，需要更頻繁的調整",
+    "",
+    "🔍 年化波動率 (Annualized Volatility)",
+    "意義: 衡量價格變動的劇烈程度",
+    "解讀:",
+    "• 波動率越高，價格變動越劇烈，風險越大",
+    "• 波動率越低，價格變動越平穩，風險較小",
+    "",
+    "🔍 報酬偏度 (Return Skewness)",
+    "意義: 衡量報酬分布的對稱性",
+    "解讀:",
+    "• 正偏度: 右尾較長，大幅上漲機率較高",
+    "• 負偏度: 左尾較長，大幅下跌機率較高",
+    "",
+    "🔍 報酬峰度 (Return Kurtosis)",
+    "意義: 衡量報酬分布的尖銳程度",
+    "解讀:",
+    "• 高峰度: 極端值出現機率較高，風險較大",
+    "• 低峰度: 分布較平坦，極端值較少",
+    "",
+    "🔍 自相關 (Autocorrelation)",
+    "意義: 衡量當前價格與過去價格的相關性",
+    "解讀:",
+    "• 正值: 價格具有趨勢性，過去走勢對未來有影響",
+    "• 負值: 價格具有均值回歸特性",
+    "",
+    "🔍 市場效率比率 (Market Efficiency Ratio)",
+    "意義: 衡量市場的資訊效率",
+    "解讀:",
+    "• 接近1: 市場效率較高，價格充分反映資訊",
+    "• 遠離1: 市場效率較低，可能存在套利機會",
+    "",
+)
+
+# TXT 報告固定段落：風險管理建議
+_TXT_RISK_ADVICE = (
+    "🎯 風險管理建議:",
+    "1. 由於高波動性，建議使用較小的倉位規模",
+    "2. 設置適當的止損位，避免極端價格變動造成的損失",
+    "3. 考慮使用期權等衍生品進行風險對沖",
+    "4. 關注市場情緒指標，避免在極端市場條件下交易",
+)
+
+# MD 報告固定段落：指標解讀指南
+_MD_INDICATOR_GUIDE = (
+    "### 📋 指標解讀指南",
+    "",
+    "- **C/A < 0.25**: 成本相對於波動率較低，適合交易",
+    "- **VR > 1**: 偏趨勢市場，適合趨勢策略",
+    "- **VR < 1**: 偏均值回歸市場，適合均值回歸策略",
+    "- **半衰期**: 建議bar週期約為0.5~1倍半衰期",
+    "- **波動率**: 反映市場波動程度",
+    "- **偏度**: 正偏度表示右尾較長，負偏度表示左尾較長",
+    "- **峰度**: 高峰度表示極端值較多",
+    "- **自相關**: 正值表示趨勢性，負值表示均值回歸",
+    "- **市場效率比率**: 越接近1表示市場越有效率",
+)
+
 
 class BinanceTimeframeAnalyzer:
     """Binance 時間框架分析器"""
@@ -68,7 +170,7 @@ class BinanceTimeframeAnalyzer:
     def load_1m_csv(self) -> pd.DataFrame:
         """讀取 1m CSV 檔案"""
         try:
-            df = pd.read_csv(self.config.csv_path)
+            df = pd.read_csv(self.config.csv_path, engine=CSV_ENGINE)
             
             # 轉換時間戳記
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', errors='coerce')
@@ -83,7 +185,10 @@ class BinanceTimeframeAnalyzer:
             for col in ['open', 'high', 'low', 'close', 'volume']:
                 df[col] = df[col].astype(float)
             
-            df = df.set_index('timestamp').sort_index()
+            df = df.set_index('timestamp')
+            # Binance 資料通常已依時間排序，先以 O(N) 檢查避免不必要的排序
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
             return df
             
         except Exception as e:
@@ -125,9 +230,11 @@ class BinanceTimeframeAnalyzer:
         if len(log_returns) < q * 2:
             return np.nan
         
-        # 計算不同時間間隔的方差
-        var_1 = log_returns.var()
-        var_q = log_returns.rolling(q).sum().var()
+        # 計算不同時間間隔的方差（q 期滾動加總以累積和相減取得）
+        r = log_returns.to_numpy(dtype=np.float64)
+        var_1 = np.var(r, ddof=1)
+        cs = np.cumsum(r)
+        var_q = np.var(cs[q - 1:] - np.concatenate(([0.0], cs[:-q])), ddof=1)
         
         if var_1 == 0:
             return np.nan
@@ -171,34 +278,14 @@ class BinanceTimeframeAnalyzer:
         min_days = self.config.min_days_per_timeframe.get(timeframe, 365)
         
         # 根據時間框架計算對應的 bar 數
-        timeframe_minutes = {
-            "1m": 1,
-            "5m": 5,
-            "15m": 15,
-            "1h": 60,
-            "4h": 240,
-            "1d": 1440,
-            "1w": 10080
-        }
-        
-        minutes_per_bar = timeframe_minutes.get(timeframe, 1440)
+        minutes_per_bar = TIMEFRAME_MINUTES.get(timeframe, 1440)
         min_bars = int(min_days * 24 * 60 / minutes_per_bar)
         
         return max(min_bars, 100)  # 至少需要 100 根 bar
     
     def annualization_factor(self, timeframe: str) -> float:
         """計算年化因子"""
-        timeframe_minutes = {
-            "1m": 1,
-            "5m": 5,
-            "15m": 15,
-            "1h": 60,
-            "4h": 240,
-            "1d": 1440,
-            "1w": 10080
-        }
-        
-        minutes_per_bar = timeframe_minutes.get(timeframe, 1440)
+        minutes_per_bar = TIMEFRAME_MINUTES.get(timeframe, 1440)
         minutes_per_year = 365 * 24 * 60
         
         return minutes_per_year / minutes_per_bar
@@ -210,22 +297,50 @@ class BinanceTimeframeAnalyzer:
         return float(returns.std() * np.sqrt(ann_factor))
     
     def calculate_skewness(self, returns: pd.Series) -> float:
-        """計算報酬偏度"""
-        if len(returns) < 3:
+        """計算報酬偏度（略過 NaN、樣本偏差修正，與 pandas skew 相同）"""
+        d = returns.to_numpy(dtype=np.float64)
+        d = d[~np.isnan(d)]
+        n = len(d)
+        if n < 3:
             return np.nan
-        return float(returns.skew())
+        if d.max() == d.min():
+            return 0.0  # 常數序列
+        d = d - d.mean()
+        m2 = np.dot(d, d)
+        m3 = np.dot(d * d, d)
+        return float(math.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5)
     
     def calculate_kurtosis(self, returns: pd.Series) -> float:
-        """計算報酬峰度"""
-        if len(returns) < 4:
+        """計算報酬超額峰度（略過 NaN、樣本偏差修正，與 pandas kurtosis 相同）"""
+        d = returns.to_numpy(dtype=np.float64)
+        d = d[~np.isnan(d)]
+        n = len(d)
+        if n < 4:
             return np.nan
-        return float(returns.kurtosis())
+        if d.max() == d.min():
+            return 0.0  # 常數序列
+        d = d - d.mean()
+        d2 = d * d
+        m2 = d2.sum()
+        m4 = np.dot(d2, d2)
+        adj = 3.0 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+        return float(n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 * m2) - adj)
     
     def calculate_autocorrelation(self, returns: pd.Series, lag: int = 1) -> float:
-        """計算報酬自相關"""
+        """計算報酬自相關（r[t] 與 r[t-lag] 的皮爾森相關係數，略過任一端為 NaN 的配對）"""
         if len(returns) < lag + 1:
             return np.nan
-        return float(returns.autocorr(lag=lag))
+        r = returns.to_numpy(dtype=np.float64)
+        x, y = r[lag:], r[:len(r) - lag]
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if len(x) < 2 or x.max() == x.min() or y.max() == y.min():
+            return np.nan
+        dx, dy = x - x.mean(), y - y.mean()
+        denom = math.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+        if denom == 0:
+            return np.nan
+        return float(np.dot(dx, dy) / denom)
     
     def calculate_market_efficiency_ratio(self, log_returns: pd.Series, q: int = 4) -> float:
         """計算市場效率比率（基於方差比）"""
@@ -272,17 +387,19 @@ class BinanceTimeframeAnalyzer:
             
             # VR
             ret = ohlc['close'].pct_change()
-            vr = self.variance_ratio(np.log1p(ret), self.config.vr_q)
+            log_ret = np.log(ohlc['close']).diff()  # 對數報酬，VR、半衰期與市場效率共用
+            vr = self.variance_ratio(log_ret, self.config.vr_q)
             
             # 半衰期
-            hl = self.estimate_half_life_by_autocorr(np.log1p(ret), self.config.half_life_max_lag)
+            hl = self.estimate_half_life_by_autocorr(log_ret, self.config.half_life_max_lag)
             
             # 新增技術指標
-            log_returns = np.log1p(ret).dropna()
-            volatility_ann = self.calculate_volatility(ret.dropna(), ann_factor)
-            skewness = self.calculate_skewness(ret.dropna())
-            kurtosis = self.calculate_kurtosis(ret.dropna())
-            autocorr_lag1 = self.calculate_autocorrelation(ret.dropna(), 1)
+            log_returns = log_ret.dropna()
+            ret_clean = ret.dropna()  # 只清理一次，四個統計量共用
+            volatility_ann = self.calculate_volatility(ret_clean, ann_factor)
+            skewness = self.calculate_skewness(ret_clean)
+            kurtosis = self.calculate_kurtosis(ret_clean)
+            autocorr_lag1 = self.calculate_autocorrelation(ret_clean, 1)
             market_efficiency = self.calculate_market_efficiency_ratio(log_returns, self.config.vr_q)
             
             row = {
@@ -402,11 +519,12 @@ class BinanceTimeframeAnalyzer:
         report.append("-" * 40)
         report.append("")
         
-        tested_timeframes = set(report_df['Timeframe'].tolist())
+        # 以時間框架為鍵的測試結果，避免每個時間框架都掃描一次 report_df
+        rows_by_tf = report_df.set_index('Timeframe', drop=False).to_dict('index')
         
         for tf_label, rule in self.config.timeframes.items():
-            if tf_label in tested_timeframes:
-                row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            if tf_label in rows_by_tf:
+                row = rows_by_tf[tf_label]
                 report.append(f"🕐 {row['Timeframe']} 時間框架")
                 report.append(f"    K線數量: {row['Bars']:,}")
                 report.append(f"    平均ATR: {row['Avg_ATR_pct']:.4f} ({row['Avg_ATR_pct']*100:.2f}%)")
@@ -455,80 +573,7 @@ class BinanceTimeframeAnalyzer:
             report.append(f"最高趨勢性時間框架: {best_vr['Timeframe']} (VR: {best_vr['VarianceRatio']:.4f})")
         
         report.append("")
-        report.append("📋 指標解讀指南:")
-        report.append("• C/A < 0.25: 成本相對於波動率較低，適合交易")
-        report.append("• VR > 1: 偏趨勢市場，適合趨勢策略")
-        report.append("• VR < 1: 偏均值回歸市場，適合均值回歸策略")
-        report.append("• 半衰期: 建議bar週期約為0.5~1倍半衰期")
-        report.append("• 波動率: 反映市場波動程度")
-        report.append("• 偏度: 正偏度表示右尾較長，負偏度表示左尾較長")
-        report.append("• 峰度: 高峰度表示極端值較多")
-        report.append("• 自相關: 正值表示趨勢性，負值表示均值回歸")
-        report.append("• 市場效率比率: 越接近1表示市場越有效率")
-        
-        # 添加詳細指標解釋
-        report.append("")
-        report.append("📊 詳細指標解釋")
-        report.append("-" * 40)
-        report.append("")
-        
-        report.append("🔍 成本/波動比 (C/A Ratio)")
-        report.append("意義: 衡量交易成本相對於市場波動的比率")
-        report.append("解讀: ")
-        report.append("• C/A < 0.25: 成本相對較低，適合頻繁交易")
-        report.append("• C/A 0.25-0.5: 成本適中，需要謹慎選擇入場點")
-        report.append("• C/A > 0.5: 成本過高，不適合短線交易")
-        report.append("")
-        
-        report.append("🔍 走勢一致性 (Variance Ratio, VR)")
-        report.append("意義: 衡量價格變動的趨勢性強度")
-        report.append("解讀:")
-        report.append("• VR > 1: 價格變動具有趨勢性，適合趨勢跟隨策略")
-        report.append("• VR < 1: 價格變動偏向隨機遊走，適合均值回歸策略")
-        report.append("• VR ≈ 1: 價格變動接近隨機遊走")
-        report.append("")
-        
-        report.append("🔍 訊號半衰期 (Signal Half-Life)")
-        report.append("意義: 衡量價格訊號的持續時間")
-        report.append("解讀:")
-        report.append("• 半衰期越長，訊號越持久，適合較長期的策略")
-        report.append("• 半衰期越短，訊號變化越快，需要更頻繁的調整")
-        report.append("")
-        
-        report.append("🔍 年化波動率 (Annualized Volatility)")
-        report.append("意義: 衡量價格變動的劇烈程度")
-        report.append("解讀:")
-        report.append("• 波動率越高，價格變動越劇烈，風險越大")
-        report.append("• 波動率越低，價格變動越平穩，風險較小")
-        report.append("")
-        
-        report.append("🔍 報酬偏度 (Return Skewness)")
-        report.append("意義: 衡量報酬分布的對稱性")
-        report.append("解讀:")
-        report.append("• 正偏度: 右尾較長，大幅上漲機率較高")
-        report.append("• 負偏度: 左尾較長，大幅下跌機率較高")
-        report.append("")
-        
-        report.append("🔍 報酬峰度 (Return Kurtosis)")
-        report.append("意義: 衡量報酬分布的尖銳程度")
-        report.append("解讀:")
-        report.append("• 高峰度: 極端值出現機率較高，風險較大")
-        report.append("• 低峰度: 分布較平坦，極端值較少")
-        report.append("")
-        
-        report.append("🔍 自相關 (Autocorrelation)")
-        report.append("意義: 衡量當前價格與過去價格的相關性")
-        report.append("解讀:")
-        report.append("• 正值: 價格具有趨勢性，過去走勢對未來有影響")
-        report.append("• 負值: 價格具有均值回歸特性")
-        report.append("")
-        
-        report.append("🔍 市場效率比率 (Market Efficiency Ratio)")
-        report.append("意義: 衡量市場的資訊效率")
-        report.append("解讀:")
-        report.append("• 接近1: 市場效率較高，價格充分反映資訊")
-        report.append("• 遠離1: 市場效率較低，可能存在套利機會")
-        report.append("")
+        report.extend(_TXT_INDICATOR_GUIDE)
         
         # 添加市場分析結論
         report.append("📈 市場分析結論")
@@ -562,8 +607,8 @@ class BinanceTimeframeAnalyzer:
         long_term_timeframes = ['1d', '1w']
         long_term_skewness = []
         for tf in long_term_timeframes:
-            if tf in report_df['Timeframe'].values:
-                row = report_df[report_df['Timeframe'] == tf].iloc[0]
+            if tf in rows_by_tf:
+                row = rows_by_tf[tf]
                 if 'Skewness' in row and not pd.isna(row['Skewness']):
                     long_term_skewness.append(row['Skewness'])
         
@@ -597,11 +642,7 @@ class BinanceTimeframeAnalyzer:
             report.append(f"3. 長線交易({', '.join(long_timeframes)}): 最適合，成本效率最佳，適合趨勢跟隨策略")
         
         report.append("")
-        report.append("🎯 風險管理建議:")
-        report.append("1. 由於高波動性，建議使用較小的倉位規模")
-        report.append("2. 設置適當的止損位，避免極端價格變動造成的損失")
-        report.append("3. 考慮使用期權等衍生品進行風險對沖")
-        report.append("4. 關注市場情緒指標，避免在極端市場條件下交易")
+        report.extend(_TXT_RISK_ADVICE)
         
         report.append("")
         report.append("🎯 最佳時間框架選擇:")
@@ -675,11 +716,12 @@ class BinanceTimeframeAnalyzer:
         report.append("| " + " | ".join(table_headers) + " |")
         report.append("|" + "|".join(["---"] * len(table_headers)) + "|")
         
-        tested_timeframes = set(report_df['Timeframe'].tolist())
+        # 以時間框架為鍵的測試結果，避免每個時間框架都掃描一次 report_df
+        rows_by_tf = report_df.set_index('Timeframe', drop=False).to_dict('index')
         
         for tf_label, rule in self.config.timeframes.items():
-            if tf_label in tested_timeframes:
-                row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            if tf_label in rows_by_tf:
+                row = rows_by_tf[tf_label]
                 
                 # 格式化數值
                 bars = f"{row['Bars']:,}"
@@ -705,8 +747,8 @@ class BinanceTimeframeAnalyzer:
         report.append("")
         
         for tf_label, rule in self.config.timeframes.items():
-            if tf_label in tested_timeframes:
-                row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            if tf_label in rows_by_tf:
+                row = rows_by_tf[tf_label]
                 report.append(f"#### 🕐 {row['Timeframe']} 時間框架")
                 report.append("")
                 report.append("**基本統計:**")
@@ -746,17 +788,7 @@ class BinanceTimeframeAnalyzer:
             report.append(f"**最高趨勢性時間框架**: {best_vr['Timeframe']} (VR: {best_vr['VarianceRatio']:.4f})")
         
         report.append("")
-        report.append("### 📋 指標解讀指南")
-        report.append("")
-        report.append("- **C/A < 0.25**: 成本相對於波動率較低，適合交易")
-        report.append("- **VR > 1**: 偏趨勢市場，適合趨勢策略")
-        report.append("- **VR < 1**: 偏均值回歸市場，適合均值回歸策略")
-        report.append("- **半衰期**: 建議bar週期約為0.5~1倍半衰期")
-        report.append("- **波動率**: 反映市場波動程度")
-        report.append("- **偏度**: 正偏度表示右尾較長，負偏度表示左尾較長")
-        report.append("- **峰度**: 高峰度表示極端值較多")
-        report.append("- **自相關**: 正值表示趨勢性，負值表示均值回歸")
-        report.append("- **市場效率比率**: 越接近1表示市場越有效率")
+        report.extend(_MD_INDICATOR_GUIDE)
         
         return "\n".join(report)
     
@@ -152,10 +152,10 @@ def custom_analysis_example():
         
         # 自定義時間框架（只分析部分時間框架）
         timeframes={
-            "5m": "5T",
-            "15m": "15T", 
-            "1h": "1H",
-            "4h": "4H"
+            "5m": "5min",
+            "15m": "15min",
+            "1h": "1h",
+            "4h": "4h"
         },
         
         # 自定義費率設定
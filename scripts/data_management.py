@@ -8,6 +8,7 @@ import os
 import glob
 import time
 import shutil
+import fnmatch
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import pandas as pd
@@ -16,7 +17,20 @@ import pandas as pd
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from binance_timeframe_analyzer import analyze_symbol
+from binance_timeframe_analyzer import analyze_symbol, CSV_ENGINE
+
+
+def _is_uniform_iso(ts: pd.Series) -> bool:
+    """時間字串是否皆為 pandas 寫出的同一種 ISO-8601 格式（等長、時區後綴相同），可依字串排序"""
+    if ts.empty or ts.isna().any():
+        return False
+    last = ts.iloc[-1]
+    try:
+        if str(pd.Timestamp(last)) != last:
+            return False
+    except (ValueError, OverflowError):
+        return False
+    return bool(ts.str.len().eq(len(last)).all() and ts.str.endswith(last[19:]).all())
 
 
 class DataManager:
@@ -30,6 +44,32 @@ class DataManager:
             "ethusdt_futures_1m.csv",
             "btcusdt_futures_1m.csv"
         ]
+        self.cache_ttl = 1.0
+        self._snapshot = None
+        self._snapshot_time = 0.0
+    
+    def _snapshot_dir(self) -> Dict[str, os.stat_result]:
+        """以單次 os.scandir 取得資料目錄下所有檔案的 stat 結果（短暫快取）"""
+        now = time.monotonic()
+        if self._snapshot is not None and now - self._snapshot_time < self.cache_ttl:
+            return self._snapshot
+        
+        snapshot = {}
+        try:
+            with os.scandir(self.data_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        snapshot[entry.name] = entry.stat()
+        except FileNotFoundError:
+            pass
+        
+        self._snapshot = snapshot
+        self._snapshot_time = now
+        return snapshot
+    
+    def _match_files(self, pattern: str) -> List[str]:
+        """在目錄快照中以萬用字元比對檔名"""
+        return sorted(name for name in self._snapshot_dir() if fnmatch.fnmatch(name, pattern))
     
     def check_data_integrity(self) -> Dict[str, bool]:
         """檢查資料完整性"""
@@ -37,21 +77,22 @@ class DataManager:
         
         results = {}
         missing_files = []
+        snapshot = self._snapshot_dir()
         
         for file in self.required_files:
-            file_path = os.path.join(self.data_dir, file)
-            exists = os.path.exists(file_path)
+            file_stat = snapshot.get(file)
+            exists = file_stat is not None
             results[file] = exists
             
             if exists:
-                file_size = os.path.getsize(file_path) / (1024 * 1024)  # MB
+                file_size = file_stat.st_size / (1024 * 1024)  # MB
                 print(f"✅ {file} - {file_size:.1f} MB")
             else:
                 missing_files.append(file)
                 print(f"❌ {file} - 缺失")
         
         # 檢查分析報告檔案
-        report_files = glob.glob(os.path.join(self.data_dir, "*_timeframe_report_*.md"))
+        report_files = self._match_files("*_timeframe_report_*.md")
         print(f"\n📊 分析報告檔案: {len(report_files)} 個")
         
         if missing_files:
@@ -69,15 +110,16 @@ class DataManager:
         print("=== 檔案詳細資訊 ===")
         
         file_info = {}
+        snapshot = self._snapshot_dir()
         
         # 原始資料檔案
-        raw_files = glob.glob(os.path.join(self.data_dir, "*_1m.csv"))
+        raw_files = self._match_files("*_1m.csv")
         total_size = 0
         
-        for file in raw_files:
-            filename = os.path.basename(file)
-            size_mb = os.path.getsize(file) / (1024 * 1024)
-            modified_time = datetime.fromtimestamp(os.path.getmtime(file))
+        for filename in raw_files:
+            file_stat = snapshot[filename]
+            size_mb = file_stat.st_size / (1024 * 1024)
+            modified_time = datetime.fromtimestamp(file_stat.st_mtime)
             
             file_info[filename] = {
                 "size_mb": size_mb,
@@ -91,13 +133,13 @@ class DataManager:
             print(f"   修改時間: {modified_time.strftime('%Y-%m-%d %H:%M:%S')}")
         
         # 分析報告檔案
-        report_files = glob.glob(os.path.join(self.data_dir, "*_timeframe_report_*"))
+        report_files = self._match_files("*_timeframe_report_*")
         report_size = 0
         
-        for file in report_files:
-            filename = os.path.basename(file)
-            size_kb = os.path.getsize(file) / 1024
-            modified_time = datetime.fromtimestamp(os.path.getmtime(file))
+        for filename in report_files:
+            file_stat = snapshot[filename]
+            size_kb = file_stat.st_size / 1024
+            modified_time = datetime.fromtimestamp(file_stat.st_mtime)
             
             file_info[filename] = {
                 "size_kb": size_kb,
@@ -215,14 +257,22 @@ class DataManager:
             return None
         
         try:
-            df = pd.read_csv(source_file)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = pd.read_csv(source_file, dtype={'timestamp': str}, engine=CSV_ENGINE)
+            ts = df['timestamp']
             
             # 取最近N天的資料
-            end_date = df['timestamp'].max()
-            start_date = end_date - timedelta(days=days)
-            
-            sample_df = df[df['timestamp'] >= start_date]
+            if _is_uniform_iso(ts):
+                # 等長且時區後綴相同的 ISO-8601 字串可直接以字串比較，只解析最大時間戳記
+                end_str = ts.max()
+                start_str = str(pd.Timestamp(end_str) - timedelta(days=days))
+                sample_df = df[ts >= start_str]
+            else:
+                # 其他格式（毫秒時間戳、Z 後綴、混合時區等）改為解析後比較
+                if ts.str.fullmatch(r'\d+').all():
+                    parsed = pd.to_datetime(ts.astype('int64'), unit='ms', utc=True)
+                else:
+                    parsed = pd.to_datetime(ts, errors='coerce', utc=True)
+                sample_df = df[parsed >= parsed.max() - timedelta(days=days)]
             sample_df.to_csv(sample_file, index=False)
             
             sample_size = len(sample_df)
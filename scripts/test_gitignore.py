@@ -9,11 +9,33 @@ import subprocess
 from pathlib import Path
 
 
+def _scan_dir(path: str) -> dict:
+    """單次讀取目錄，回傳 {檔名: DirEntry}；目錄不存在時回傳空字典"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name: entry for entry in it if entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def _print_file_sizes(files, entries, unit: str):
+    """依目錄快照輸出檔案大小，不再逐檔呼叫 os.path.exists/getsize"""
+    divisor = 1024 * 1024 if unit == "MB" else 1024
+    for file in files:
+        entry = entries.get(os.path.basename(file))
+        if entry is not None:
+            print(f"  {file} - {entry.stat().st_size / divisor:.1f} {unit}")
+        else:
+            print(f"  {file} - 不存在")
+
+
 def test_gitignore():
     """測試 .gitignore 設定"""
     print("🔍 測試 .gitignore 設定")
     print("=" * 50)
     
+    data_entries = _scan_dir("data")
+    
     # 檢查大型原始資料檔案是否被忽略
     large_files = [
         "data/ethusdt_spot_1m.csv",
@@ -23,12 +45,7 @@ def test_gitignore():
     ]
     
     print("📁 檢查大型原始資料檔案:")
-    for file in large_files:
-        if os.path.exists(file):
-            size_mb = os.path.getsize(file) / (1024 * 1024)
-            print(f"  {file} - {size_mb:.1f} MB")
-        else:
-            print(f"  {file} - 不存在")
+    _print_file_sizes(large_files, data_entries, "MB")
     
     # 檢查分析報告檔案是否會被追蹤
     report_files = [
@@ -38,12 +55,7 @@ def test_gitignore():
     ]
     
     print("\n📊 檢查分析報告檔案:")
-    for file in report_files:
-        if os.path.exists(file):
-            size_kb = os.path.getsize(file) / 1024
-            print(f"  {file} - {size_kb:.1f} KB")
-        else:
-            print(f"  {file} - 不存在")
+    _print_file_sizes(report_files, data_entries, "KB")
     
     # 使用 git check-ignore 測試
     print("\n🔍 使用 git check-ignore 測試:")
@@ -56,21 +68,27 @@ def test_gitignore():
         "data/ethusdt_futures_timeframe_report_20220820-20250819.csv"  # 不應該被忽略
     ]
     
-    for file in test_files:
+    if not Path(".git").exists():
+        print("  ⚠️  目前目錄不是 Git 儲存庫，略過 git check-ignore 測試")
+    else:
         try:
+            # 以單一 git check-ignore --stdin 呼叫檢查所有路徑
             result = subprocess.run(
-                ["git", "check-ignore", file], 
-                capture_output=True, 
+                ["git", "check-ignore", "--stdin"],
+                input="\n".join(test_files) + "\n",
+                capture_output=True,
                 text=True
             )
+            ignored = set(result.stdout.splitlines())
             
-            if result.returncode == 0:
-                print(f"  ❌ {file} - 被忽略")
-            else:
-                print(f"  ✅ {file} - 不被忽略")
-                
+            for file in test_files:
+                if file in ignored:
+                    print(f"  ❌ {file} - 被忽略")
+                else:
+                    print(f"  ✅ {file} - 不被忽略")
+                    
         except FileNotFoundError:
-            print(f"  ⚠️  {file} - Git 命令不可用")
+            print("  ⚠️  Git 命令不可用")
     
     print("\n📋 總結:")
     print("✅ 大型原始資料檔案 (*_1m.csv) 應該被忽略")
@@ -78,6 +96,19 @@ def test_gitignore():
     print("✅ 資料目錄 README 應該被追蹤")
 
 
+def _scandir_recursive(path):
+    """以 os.scandir 遞迴列出檔案（DirEntry 會快取 stat 結果）"""
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _scandir_recursive(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry
+    except PermissionError:
+        return
+
+
 def check_file_sizes():
     """檢查檔案大小分布"""
     print("\n📊 檔案大小分布:")
@@ -93,16 +124,15 @@ def check_file_sizes():
     report_files = []
     other_files = []
     
-    for file in data_dir.rglob("*"):
-        if file.is_file():
-            size_mb = file.stat().st_size / (1024 * 1024)
-            
-            if "_1m.csv" in file.name:
-                raw_files.append((file.name, size_mb))
-            elif "timeframe_report" in file.name:
-                report_files.append((file.name, size_mb))
-            else:
-                other_files.append((file.name, size_mb))
+    for entry in _scandir_recursive(data_dir):
+        size_mb = entry.stat(follow_symlinks=False).st_size / (1024 * 1024)
+        
+        if "_1m.csv" in entry.name:
+            raw_files.append((entry.name, size_mb))
+        elif "timeframe_report" in entry.name:
+            report_files.append((entry.name, size_mb))
+        else:
+            other_files.append((entry.name, size_mb))
     
     # 顯示結果
     print("📁 原始資料檔案:")
@@ -4,6 +4,11 @@
 驗證現貨和永續合約分析功能
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
 from binance_analyzer_config import BinanceAnalyzerConfig
 from binance_timeframe_analyzer import BinanceTimeframeAnalyzer, analyze_symbol, get_available_symbols
 from binance_api_utils import BinanceAPI
@@ -118,19 +123,55 @@ def test_analyzer_creation():
     
     print("✅ 分析器創建測試通過")
 
+def test_return_statistics_with_nan():
+    """測試報酬統計在含 NaN 的序列上與 pandas 結果一致"""
+    print("\n=== 測試含 NaN 的報酬統計 ===")
+    
+    analyzer = BinanceTimeframeAnalyzer(BinanceAnalyzerConfig(symbol="ETHUSDT", market_type="spot"))
+    returns = pd.Series(np.random.default_rng(0).normal(0, 0.01, 500))
+    returns.iloc[[0, 17, 250, 499]] = np.nan
+    
+    assert np.isclose(analyzer.calculate_skewness(returns), returns.skew())
+    assert np.isclose(analyzer.calculate_kurtosis(returns), returns.kurt())
+    for lag in (1, 5):
+        assert np.isclose(analyzer.calculate_autocorrelation(returns, lag), returns.autocorr(lag))
+    
+    print("✅ 含 NaN 的報酬統計測試通過")
+
+def test_resample_nan_volume():
+    """測試 1 分鐘快速路徑與 resample 聚合對 NaN 成交量的處理一致"""
+    print("\n=== 測試 NaN 成交量的重採樣 ===")
+    
+    from timeframe_selector_ethusdt import resample_ohlcv
+    
+    index = pd.date_range("2024-01-01", periods=10, freq="1min", tz="UTC")
+    prices = np.linspace(100.0, 101.0, 10)
+    df = pd.DataFrame({"open": prices, "high": prices + 0.5, "low": prices - 0.5,
+                       "close": prices, "volume": np.ones(10)}, index=index)
+    df.iloc[3, df.columns.get_loc("volume")] = np.nan
+    
+    expected = df.resample("1min", label="right", closed="right").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+    result = resample_ohlcv(df, "1min")
+    assert result["volume"].iloc[3] == 0.0
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+    
+    print("✅ NaN 成交量重採樣測試通過")
+
 def test_quick_analysis_function():
     """測試快速分析函數"""
     print("\n=== 測試快速分析函數 ===")
     
     try:
-        # 測試現貨快速分析（使用較短時間）
-        print("測試 ETHUSDT 現貨快速分析...")
-        spot_report = analyze_symbol("ETHUSDT", "spot", 30)
-        print(f"現貨分析完成，結果包含 {len(spot_report)} 個時間框架")
+        # 現貨與永續合約分析互不相依，同時執行（使用較短時間）
+        print("測試 ETHUSDT 現貨與永續合約快速分析...")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            spot_future = executor.submit(analyze_symbol, "ETHUSDT", "spot", 30)
+            futures_future = executor.submit(analyze_symbol, "ETHUSDT", "futures", 30)
+            spot_report = spot_future.result()
+            futures_report = futures_future.result()
         
-        # 測試永續合約快速分析（使用較短時間）
-        print("測試 ETHUSDT 永續合約快速分析...")
-        futures_report = analyze_symbol("ETHUSDT", "futures", 30)
+        print(f"現貨分析完成，結果包含 {len(spot_report)} 個時間框架")
         print(f"永續合約分析完成，結果包含 {len(futures_report)} 個時間框架")
         
         print("✅ 快速分析函數測試通過")
@@ -151,6 +192,8 @@ def main():
         test_config_differences()
         test_available_symbols()
         test_analyzer_creation()
+        test_return_statistics_with_nan()
+        test_resample_nan_volume()
         test_quick_analysis_function()
         
         print("\n🎉 所有測試完成！")
@@ -24,17 +24,41 @@ ETHUSDT 時間框架特性分析工具
 - 分析結果基於技術指標，提供時間框架選擇的客觀參考
 """
 
+import functools
+import hashlib
+import json
 import math
 import warnings
 import requests
 import time
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 
 import numpy as np
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from binance_analyzer_config import DEFAULT_TIMEFRAMES, TIMEFRAME_MINUTES
+from binance_api_utils import (
+    INTERVAL_MS, KLINES_PER_REQUEST, get_kline_rate_limiter, get_session,
+    klines_to_dataframe, throttle_by_used_weight,
+)
+
+# 若有安裝 pyarrow 且 pandas >= 1.4，CSV 解析改用 pyarrow 引擎（多執行緒，速度快數倍）
+# 注意：pandas 2.x 起 pyarrow 引擎會直接把時間字串解析成秒精度（datetime64[s]），
+# 之後的重採樣與指標計算都沿用索引本身的時間單位，不假設為奈秒
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+_PANDAS_VERSION = tuple(int(p) for p in pd.__version__.split(".")[:2])
+CSV_ENGINE = "pyarrow" if HAS_PYARROW and _PANDAS_VERSION >= (1, 4) else "c"
 
 warnings.filterwarnings("ignore")
 
@@ -43,6 +67,9 @@ warnings.filterwarnings("ignore")
 # ======== CONFIG =======
 # =======================
 
+# 來源資料頻率（1 分鐘）
+_SOURCE_OFFSET = to_offset("1min")
+
 @dataclass
 class Config:
     # 資料抓取設定
@@ -62,9 +89,12 @@ class Config:
     generate_csv_report: bool = True           # 生成CSV報告
     generate_txt_report: bool = True           # 生成TXT報告
     generate_md_report: bool = True            # 生成MD報告
+    generate_parquet_report: bool = False      # 生成Parquet報告（需安裝 pyarrow，供程式讀取）
     
-    # CSV 檔案路徑（如果 auto_fetch=False 則使用此路徑）
+    # CSV 檔案路徑（如果 auto_fetch=False 則使用此路徑；副檔名為 .parquet 時改用 Parquet 格式）
     csv_path: str = "./data/ethusdt_1m.csv"
+    # CSV 解析結果另存為 <csv>.parquet 副檔，下次直接讀取（預設停用；需安裝 pyarrow）
+    csv_sidecar: bool = False
 
     # CSV 欄位名（大小寫與實際一致或由 detect_columns() 自動對映）
     ts_col: str = "timestamp"
@@ -103,17 +133,26 @@ class Config:
     # 各時間框架的最小資料天數要求
     min_days_per_timeframe: Dict[str, int] = None
 
+    # 同時進行的 K線請求數
+    fetch_workers: int = 8
+
+    # K線下載快取（已收盤的請求區間會存到本地；預設停用，例如 "./data/kline_cache"）
+    kline_cache_dir: Optional[str] = None
+    kline_cache_max_mb: int = 1024
+
+    # 重採樣結果快取（預設停用；需安裝 pyarrow，例如 "./data/resample_cache"）
+    resample_cache_dir: Optional[str] = None
+    resample_cache_max_mb: int = 256
+
+    # 同時分析的時間框架數（多行程，1 表示依序執行）
+    analysis_workers: int = 1
+
+    # 重採樣後以 float32 保存 OHLCV（記憶體與行程間傳輸減半，指標仍以 float64 計算）
+    ohlcv_float32: bool = False
+
     def __post_init__(self):
         if self.timeframes is None:
-            self.timeframes = {
-                "1m": "1T",
-                "5m": "5T", 
-                "15m": "15T",
-                "1h": "1H",
-                "4h": "4H",
-                "1d": "1D",
-                "1w": "1W"
-            }
+            self.timeframes = dict(DEFAULT_TIMEFRAMES)
         
         if self.min_days_per_timeframe is None:
             self.min_days_per_timeframe = {
@@ -134,7 +173,92 @@ CFG = Config()
 # ====== DATA FETCH =====
 # =======================
 
-def fetch_binance_klines(symbol: str, interval: str, start_time: int, end_time: int) -> List[List]:
+class KlineCache:
+    """已收盤K線請求區間的本地快取，以 (symbol, interval, start, end) 為鍵"""
+
+    def __init__(self, cache_dir: str, max_mb: int = 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None  # 快取總大小，首次 prune 時掃描一次，之後由 put 累加
+
+    def _path(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> str:
+        return os.path.join(self.cache_dir, symbol, interval, f"{start_ms}_{end_ms}.json")
+
+    def get(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> Optional[List[List]]:
+        path = self._path(symbol, interval, start_ms, end_ms)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                klines = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # 更新存取時間供 LRU 淘汰
+        except OSError:
+            pass  # 其他程序共用快取目錄時，檔案可能剛被淘汰
+        return klines
+
+    def put(self, symbol: str, interval: str, start_ms: int, end_ms: int, klines: List[List]) -> None:
+        path = self._path(symbol, interval, start_ms, end_ms)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(klines, f, separators=(",", ":"))
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size
+
+    def prune(self) -> None:
+        """超過容量上限時，依最後存取時間刪除最舊的檔案；未超過上限時不掃描目錄"""
+        with self._lock:
+            if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+                return
+        total = prune_cache_dir(self.cache_dir, self.max_bytes)
+        with self._lock:
+            self._total_bytes = total
+
+
+def prune_cache_dir(cache_dir: str, max_bytes: int) -> int:
+    """目錄超過容量上限時依 mtime 刪除最舊的檔案（LRU），回傳剩餘總大小"""
+    files = []
+    for root, _, names in os.walk(cache_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue  # 掃描中被其他程序刪除
+            files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # 已被其他程序刪除
+        total -= size
+    return total
+
+
+# 每個快取目錄共用一個 KlineCache，目錄大小在同一次執行中只需掃描一次
+_KLINE_CACHES: Dict[Tuple[str, int], KlineCache] = {}
+
+
+def make_kline_cache(cfg: Config) -> Optional[KlineCache]:
+    """依設定建立K線快取"""
+    if not cfg.kline_cache_dir:
+        return None
+    key = (os.path.abspath(cfg.kline_cache_dir), cfg.kline_cache_max_mb)
+    if key not in _KLINE_CACHES:
+        _KLINE_CACHES[key] = KlineCache(cfg.kline_cache_dir, cfg.kline_cache_max_mb)
+    return _KLINE_CACHES[key]
+
+
+def fetch_binance_klines(symbol: str, interval: str, start_time: int, end_time: int,
+                         cache: Optional[KlineCache] = None) -> List[List]:
     """
     從 Binance API 抓取 K線資料
     
@@ -143,29 +267,68 @@ def fetch_binance_klines(symbol: str, interval: str, start_time: int, end_time:
         interval: 時間間隔 ("1m", "5m", "1h", "1d" 等)
         start_time: 開始時間戳記 (毫秒)
         end_time: 結束時間戳記 (毫秒)
+        cache: K線快取，已收盤的區間會先查快取
     
     Returns:
         K線資料列表
     """
+    # 只快取對齊 1000 根邊界、且結束超過兩根 bar 以前（已收盤）的區間
+    interval_ms = INTERVAL_MS.get(interval)
+    cacheable = (cache is not None and interval_ms is not None
+                 and start_time % (KLINES_PER_REQUEST * interval_ms) == 0
+                 and end_time < time.time() * 1000 - 2 * interval_ms)
+    if cacheable:
+        klines = cache.get(symbol, interval, start_time, end_time)
+        if klines is not None:
+            return klines
+    
     url = "https://api.binance.com/api/v3/klines"
     params = {
         "symbol": symbol,
         "interval": interval,
         "startTime": start_time,
         "endTime": end_time,
-        "limit": 1000  # Binance 單次請求最大限制
+        "limit": KLINES_PER_REQUEST  # Binance 單次請求最大限制
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        get_kline_rate_limiter("spot").acquire()
+        response = get_session().get(url, params=params, timeout=10)
         response.raise_for_status()
-        return response.json()
+        throttle_by_used_weight(response)
+        klines = response.json()
     except requests.exceptions.RequestException as e:
         print(f"抓取資料時發生錯誤: {e}")
         return []
+    
+    if cacheable and klines:
+        cache.put(symbol, interval, start_time, end_time, klines)
+    return klines
+
 
+def split_request_windows(start_ms: int, end_ms: int, step: int) -> List[Tuple[int, int]]:
+    """將時間範圍切成對齊 step 邊界的請求區間，使快取鍵在每次執行間保持一致"""
+    bounds = [start_ms]
+    bounds.extend(range((start_ms // step + 1) * step, end_ms, step))
+    bounds.append(end_ms)
+    return list(zip(bounds[:-1], bounds[1:]))
 
-def fetch_historical_data(symbol: str, days: int, interval: str = "1m") -> pd.DataFrame:
+
+def fetch_windows(symbol: str, interval: str, windows: List[Tuple[int, int]],
+                  max_workers: int = 8, cache: Optional[KlineCache] = None) -> List[List[List]]:
+    """並行抓取多個請求區間，結果順序與 windows 相同；速率由權重標頭控制"""
+    print(f"共 {len(windows)} 個請求區間，以 {max_workers} 個連線並行抓取...")
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(
+            lambda w: fetch_binance_klines(symbol, interval, w[0], w[1], cache), windows))
+    
+    if cache is not None:
+        cache.prune()
+    return results
+
+
+def fetch_historical_data(symbol: str, days: int, interval: str = "1m",
+                          max_workers: int = 8, cache: Optional[KlineCache] = None) -> pd.DataFrame:
     """
     抓取指定天數的歷史資料
     
@@ -173,6 +336,8 @@ def fetch_historical_data(symbol: str, days: int, interval: str = "1m") -> pd.Da
         symbol: 交易對
         days: 要抓取的天數
         interval: 時間間隔
+        max_workers: 同時進行的請求數
+        cache: K線快取
     
     Returns:
         包含 OHLCV 資料的 DataFrame
@@ -183,48 +348,30 @@ def fetch_historical_data(symbol: str, days: int, interval: str = "1m") -> pd.Da
     end_time = int(time.time() * 1000)  # 現在時間 (毫秒)
     start_time = end_time - (days * 24 * 60 * 60 * 1000)  # days 天前
     
-    all_data = []
-    current_start = start_time
+    # 預先切分請求區間，每次最多1000根K線（區間長度依 interval 而定）
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"不支援的K線間隔: {interval}")
+    step = KLINES_PER_REQUEST * INTERVAL_MS[interval]
+    windows = split_request_windows(start_time, end_time, step)
+    results = fetch_windows(symbol, interval, windows, max_workers, cache)
     
-    while current_start < end_time:
-        current_end = min(current_start + (1000 * 60 * 1000), end_time)  # 每次最多1000根K線
-        
-        print(f"抓取 {datetime.fromtimestamp(current_start/1000)} 到 {datetime.fromtimestamp(current_end/1000)} 的資料...")
-        
-        klines = fetch_binance_klines(symbol, interval, current_start, current_end)
-        
+    all_data = []
+    for (current_start, current_end), klines in zip(windows, results):
         if not klines:
-            print("警告：此時間範圍沒有資料，跳過...")
-            current_start = current_end
+            print(f"警告：{datetime.fromtimestamp(current_start/1000)} 到 "
+                  f"{datetime.fromtimestamp(current_end/1000)} 沒有資料，跳過...")
             continue
-        
         all_data.extend(klines)
-        current_start = current_end
-        
-        # 避免請求過於頻繁
-        time.sleep(0.1)
     
     if not all_data:
         raise ValueError("沒有抓取到任何資料")
     
     # 轉換為 DataFrame
-    df = pd.DataFrame(all_data, columns=[
-        'timestamp', 'open', 'high', 'low', 'close', 'volume',
-        'close_time', 'quote_asset_volume', 'number_of_trades',
-        'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-    ])
-    
-    # 轉換資料類型
-    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-    for col in ['open', 'high', 'low', 'close', 'volume']:
-        df[col] = df[col].astype(float)
-    
-    # 設定時區
-    df['timestamp'] = df['timestamp'].dt.tz_localize('UTC')
+    df = klines_to_dataframe(all_data)
     
     # 排序並去重
-    df = df.sort_values('timestamp').drop_duplicates(subset=['timestamp'])
-    df = df.set_index('timestamp')
+    df = df.sort_index()
+    df = df[~df.index.duplicated()]
     
     print(f"成功抓取 {len(df)} 根K線資料")
     print(f"資料時間範圍: {df.index.min()} 到 {df.index.max()}")
@@ -233,9 +380,12 @@ def fetch_historical_data(symbol: str, days: int, interval: str = "1m") -> pd.Da
 
 
 def save_data_to_csv(df: pd.DataFrame, filepath: str) -> None:
-    """將資料儲存為 CSV 檔案"""
+    """將資料儲存為 CSV 檔案（副檔名為 .parquet 時改存 Parquet）"""
     try:
-        df.to_csv(filepath, encoding='utf-8-sig')
+        if filepath.endswith('.parquet'):
+            df.to_parquet(filepath, compression='snappy')
+        else:
+            df.to_csv(filepath, encoding='utf-8-sig')
         print(f"資料已儲存至: {filepath}")
     except Exception as e:
         print(f"儲存CSV時發生錯誤: {e}")
@@ -251,7 +401,8 @@ def load_or_fetch_data(cfg: Config) -> pd.DataFrame:
     if cfg.auto_fetch:
         print("=== 自動抓取模式 ===")
         try:
-            df = fetch_historical_data(cfg.symbol, cfg.data_days)
+            df = fetch_historical_data(cfg.symbol, cfg.data_days, max_workers=cfg.fetch_workers,
+                                       cache=make_kline_cache(cfg))
             
             if cfg.save_csv:
                 save_data_to_csv(df, cfg.csv_path)
@@ -299,8 +450,8 @@ def check_existing_data(cfg: Config) -> Tuple[bool, pd.DataFrame, Dict]:
             "data_completeness": min(total_days / expected_days, 1.0),
             "total_bars": len(df),
             "missing_bars": 0,
-            "duplicate_bars": df.index.duplicated().sum(),
-            "null_values": df.isnull().sum().sum()
+            "duplicate_bars": int(np.count_nonzero(df.index.duplicated())) if df.index.has_duplicates else 0,
+            "null_values": int(np.count_nonzero(df.isnull().to_numpy()))
         }
         
         # 檢查是否有缺失的時間點
@@ -333,45 +484,40 @@ def check_data_quality(df: pd.DataFrame, cfg: Config) -> Dict:
         issues.append(f"缺少必要欄位: {missing_cols}")
         score -= 0.3
     
-    # 2. 檢查時間序列完整性
-    time_diff = df.index.to_series().diff().dropna()
-    expected_diff = pd.Timedelta(minutes=1)
-    irregular_intervals = (time_diff != expected_diff).sum()
+    # 2. 檢查時間序列完整性（直接對索引底層陣列做差分，少於兩根時 diff 為空）
+    time_diff = np.diff(df.index.values)
+    irregular_intervals = int(np.count_nonzero(time_diff != np.timedelta64(1, 'm')))
     if irregular_intervals > 0:
         issues.append(f"時間間隔不規則: {irregular_intervals} 處")
         score -= min(0.2, irregular_intervals / len(df) * 0.5)
     
-    # 3. 檢查重複資料
-    duplicates = df.index.duplicated().sum()
+    # 3. 檢查重複資料（has_duplicates 的唯一性檢查結果會快取在索引上，無重複時不建立遮罩）
+    duplicates = int(np.count_nonzero(df.index.duplicated())) if df.index.has_duplicates else 0
     if duplicates > 0:
         issues.append(f"重複時間戳記: {duplicates} 個")
         score -= min(0.2, duplicates / len(df) * 0.5)
     
     # 4. 檢查缺失值
-    null_counts = df.isnull().sum()
-    total_nulls = null_counts.sum()
+    total_nulls = int(np.count_nonzero(df.isnull().to_numpy()))
     if total_nulls > 0:
         issues.append(f"缺失值: {total_nulls} 個")
         score -= min(0.2, total_nulls / (len(df) * len(df.columns)) * 0.5)
     
-    # 5. 檢查價格邏輯
-    price_errors = ((df['high'] < df['low']) | 
-                   (df['open'] > df['high']) | 
-                   (df['close'] > df['high']) |
-                   (df['open'] < df['low']) | 
-                   (df['close'] < df['low'])).sum()
+    # 5. 檢查價格邏輯（一次取出 OHLC 區塊，open/close 以 max/min 合併比較）
+    price_cols = ['open', 'high', 'low', 'close']
+    prices = df[price_cols].to_numpy(dtype=np.float64)
+    o, h, l, c = prices.T
+    price_errors = int(np.count_nonzero(
+        (h < l) | (np.maximum(o, c) > h) | (np.minimum(o, c) < l)))
     if price_errors > 0:
         issues.append(f"價格邏輯錯誤: {price_errors} 筆")
         score -= min(0.3, price_errors / len(df) * 0.5)
     
-    # 6. 檢查異常值
-    for col in ['open', 'high', 'low', 'close']:
-        if col in df.columns:
-            # 檢查是否有零值或負值
-            zero_or_negative = (df[col] <= 0).sum()
-            if zero_or_negative > 0:
-                issues.append(f"{col} 欄位有零值或負值: {zero_or_negative} 筆")
-                score -= min(0.1, zero_or_negative / len(df) * 0.3)
+    # 6. 檢查異常值（零值或負值）
+    for col, zero_or_negative in zip(price_cols, np.count_nonzero(prices <= 0, axis=0)):
+        if zero_or_negative > 0:
+            issues.append(f"{col} 欄位有零值或負值: {zero_or_negative} 筆")
+            score -= min(0.1, zero_or_negative / len(df) * 0.3)
     
     # 7. 檢查成交量
     if 'volume' in df.columns:
@@ -388,13 +534,14 @@ def check_data_quality(df: pd.DataFrame, cfg: Config) -> Dict:
     
     score = max(0.0, score)
     
-    return {
+    quality_report = {
         "quality_score": score,
         "issues": issues,
         "total_bars": len(df),
         "time_range": f"{df.index.min()} 到 {df.index.max()}",
         "data_completeness": len(df) / (cfg.data_days * 24 * 60) if cfg.data_days > 0 else 1.0
     }
+    return quality_report
 
 
 def get_missing_date_ranges(df: pd.DataFrame, target_days: int) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
@@ -423,14 +570,9 @@ def get_missing_date_ranges(df: pd.DataFrame, target_days: int) -> List[Tuple[pd
     if df.index.max() < end_time:
         missing_ranges.append((df.index.max(), end_time))
     
-    # 檢查中間的間隙
-    time_diff = df.index.to_series().diff().dropna()
-    expected_diff = pd.Timedelta(minutes=1)
-    gap_indices = time_diff[time_diff > expected_diff].index
-    
-    for gap_start in gap_indices:
-        gap_end = gap_start + time_diff[gap_start]
-        missing_ranges.append((gap_start, gap_end))
+    # 檢查中間的間隙（相鄰 bar 間隔超過 1 分鐘，缺口介於前後兩根 bar 之間）
+    gap_idx = np.flatnonzero(np.diff(df.index.values) > np.timedelta64(1, 'm'))
+    missing_ranges.extend(zip(df.index[gap_idx], df.index[gap_idx + 1]))
     
     return missing_ranges
 
@@ -452,39 +594,24 @@ def fetch_incremental_data(df: pd.DataFrame, cfg: Config) -> pd.DataFrame:
     
     print(f"發現 {len(missing_ranges)} 個缺失時間範圍")
     
-    new_data = []
+    # 超過 1000 根的缺口先切成多個請求區間，再一起並行抓取
+    step = KLINES_PER_REQUEST * INTERVAL_MS["1m"]
+    windows = []
     for i, (start_time, end_time) in enumerate(missing_ranges):
-        print(f"下載缺失資料 {i+1}/{len(missing_ranges)}: {start_time} 到 {end_time}")
-        
+        print(f"缺失資料 {i+1}/{len(missing_ranges)}: {start_time} 到 {end_time}")
         start_ms = int(start_time.timestamp() * 1000)
         end_ms = int(end_time.timestamp() * 1000)
-        
-        klines = fetch_binance_klines(cfg.symbol, "1m", start_ms, end_ms)
-        
-        if klines:
-            # 轉換為DataFrame
-            temp_df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            temp_df['timestamp'] = pd.to_datetime(temp_df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                temp_df[col] = temp_df[col].astype(float)
-            
-            temp_df['timestamp'] = temp_df['timestamp'].dt.tz_localize('UTC')
-            temp_df = temp_df.set_index('timestamp')
-            
-            new_data.append(temp_df)
-        
-        time.sleep(0.1)  # 避免API限制
+        windows.extend(split_request_windows(start_ms, end_ms, step))
+    
+    results = fetch_windows(cfg.symbol, "1m", windows, cfg.fetch_workers, make_kline_cache(cfg))
+    new_data = [klines for klines in results if klines]
     
     if new_data:
         # 合併新資料
-        new_df = pd.concat(new_data)
+        new_df = klines_to_dataframe([row for klines in new_data for row in klines])
         combined_df = pd.concat([df, new_df])
-        combined_df = combined_df.sort_index().drop_duplicates()
+        combined_df = combined_df.sort_index()
+        combined_df = combined_df[~combined_df.index.duplicated()]
         
         print(f"增量更新完成，新增 {len(new_df)} 根K線")
         return combined_df
@@ -497,13 +624,28 @@ def smart_data_loader(cfg: Config) -> pd.DataFrame:
     """
     智能資料載入器：檢查現有資料，決定是否需要下載或更新
     
+    Args:
+        cfg: 配置物件
+    
     Returns:
         完整的DataFrame
     """
+    df, _ = smart_data_loader_with_report(cfg)
+    return df
+
+
+def smart_data_loader_with_report(cfg: Config) -> Tuple[pd.DataFrame, Optional[Dict]]:
+    """
+    同 smart_data_loader，並一併回傳載入時已計算的資料品質報告
+    
+    Returns:
+        (DataFrame, 品質報告)；品質報告僅在直接使用現有資料時可重用，其餘情況為 None
+    """
     print("=== 智能資料管理 ===")
     
     # 檢查現有資料
     data_exists, existing_df, status = check_existing_data(cfg)
+    quality_report = None
     
     if data_exists:
         print(f"發現現有資料: {status['total_bars']} 根K線")
@@ -528,32 +670,38 @@ def smart_data_loader(cfg: Config) -> pd.DataFrame:
         # 決定是否需要重新下載
         if cfg.force_redownload:
             print("強制重新下載模式")
-            return fetch_historical_data(cfg.symbol, cfg.data_days)
+            return fetch_historical_data(cfg.symbol, cfg.data_days, max_workers=cfg.fetch_workers,
+                                         cache=make_kline_cache(cfg)), None
         
         # 檢查是否需要增量更新
         if cfg.incremental_update and status['data_completeness'] < 0.95:
             print("資料不完整，進行增量更新...")
-            return fetch_incremental_data(existing_df, cfg)
+            return fetch_incremental_data(existing_df, cfg), None
         
         print("使用現有資料")
-        return existing_df
+        return existing_df, quality_report
     
     else:
         print("沒有現有資料，開始下載...")
-        return fetch_historical_data(cfg.symbol, cfg.data_days)
+        return fetch_historical_data(cfg.symbol, cfg.data_days, max_workers=cfg.fetch_workers,
+                                     cache=make_kline_cache(cfg)), None
 
 
-def generate_data_report(df: pd.DataFrame, cfg: Config) -> str:
+def generate_data_report(df: pd.DataFrame, cfg: Config, quality_report: Optional[Dict] = None) -> str:
     """
     產生詳細的資料報告
     
+    Args:
+        quality_report: 已計算的資料品質報告，省略時自動計算
+    
     Returns:
         報告文字
     """
     if df is None or df.empty:
         return "資料報告: 無資料"
     
-    quality_report = check_data_quality(df, cfg)
+    if quality_report is None:
+        quality_report = check_data_quality(df, cfg)
     
     report = []
     report.append("=" * 50)
@@ -588,6 +736,99 @@ def generate_data_report(df: pd.DataFrame, cfg: Config) -> str:
     return "\n".join(report)
 
 
+# TXT 報告固定段落：指標解讀指南與詳細指標解釋
+_TXT_INDICATOR_GUIDE = (
+    "📋 指標解讀指南:",
+    "• C/A < 0.25: 成本相對於波動率較低，適合交易",
+    "• VR > 1: 偏趨勢市場，適合趨勢策略",
+    "• VR < 1: 偏均值回歸市場，適合均值回歸策略",
+    "• 半衰期: 建議bar週期約為0.5~1倍半衰期",
+    "• 波動率: 反映市場波動程度",
+    "• 偏度: 正偏度表示右尾較長，負偏度表示左尾較長",
+    "• 峰度: 高峰度表示極端值較多",
+    "• 自相關: 正值表示趨勢性，負值表示均值回歸",
+    "• 市場效率比率: 越接近1表示市場越有效率",
+    "",
+    "📊 詳細指標解釋",
+    "-" * 40,
+    "",
+    "🔍 成本/波動比 (C/A Ratio)",
+    "意義: 衡量交易成本相對於市場波動的比率",
+    "解讀: ",
+    "• C/A < 0.25: 成本相對較低，適合頻繁交易",
+    "• C/A 0.25-0.5: 成本適中，需要謹慎選擇入場點",
+    "• C/A > 0.5: 成本過高，不適合短線交易",
+    "",
+    "🔍 走勢一致性 (Variance Ratio, VR)",
+    "意義: 衡量價格變動的趨勢性強度",
+    "解讀:",
+    "• VR > 1: 價格變動具有趨勢性，適合趨勢跟隨策略",
+    "• VR < 1: 價格變動偏向隨機遊走，適合均值回歸策略",
+    "• VR ≈ 1: 價格變動接近隨機遊走",
+    "",
+    "🔍 訊號半衰期 (Signal Half-Life)",
+    "意義: 衡量價格訊號的持續時間",
+    "解讀:",
+    "• 半衰期越長，訊號越持久，適合較長期的策略",
+    "• 半衰期越短，訊號變化越快，需要更頻繁的調整",
+    "",
+    "🔍 年化波動率 (Annualized Volatility)",
+    "意義: 衡量價格變動的劇烈程度",
+    "解讀:",
+    "• 波動率越高，價格變動越劇烈，風險越大",
+    "• 波動率越低，價格變動越平穩，風險較小",
+    "",
+    "🔍 報酬偏度 (Return Skewness)",
+    "意義: 衡量報酬分布的對稱性",
+    "解讀:",
+    "• 正偏度: 右尾較長，大幅上漲機率較高",
+    "• 負偏度: 左尾較長，大幅下跌機率較高",
+    "",
+    "🔍 報酬峰度 (Return Kurtosis)",
+    "意義: 衡量報酬分布的尖銳程度",
+    "解讀:",
+    "• 高峰度: 極端值出現機率較高，風險較大",
+    "• 低峰度: 分布較平坦，極端值較少",
+    "",
+    "🔍 自相關 (Autocorrelation)",
+    "意義: 衡量當前價格與過去價格的相關性",
+    "解讀:",
+    "• 正值: 價格具有趨勢性，過去走勢對未來有影響",
+    "• 負值: 價格具有均值回歸特性",
+    "",
+    "🔍 市場效率比率 (Market Efficiency Ratio)",
+    "意義: 衡量市場的資訊效率",
+    "解讀:",
+    "• 接近1: 市場效率較高，價格充分反映資訊",
+    "• 遠離1: 市場效率較低，可能存在套利機會",
+    "",
+)
+
+# TXT 報告固定段落：風險管理建議
+_TXT_RISK_ADVICE = (
+    "🎯 風險管理建議:",
+    "1. 由於高波動性，建議使用較小的倉位規模",
+    "2. 設置適當的止損位，避免極端價格變動造成的損失",
+    "3. 考慮使用期權等衍生品進行風險對沖",
+    "4. 關注市場情緒指標，避免在極端市場條件下交易",
+)
+
+# MD 報告固定段落：指標解讀指南
+_MD_INDICATOR_GUIDE = (
+    "### 📋 指標解讀指南",
+    "",
+    "| 指標 | 解讀 |",
+    "|------|------|",
+    "| C/A < 0.25 | 成本相對於波動率較低，適合交易 |",
+    "| VR > 1 | 偏趨勢市場，適合趨勢策略 |",
+    "| VR < 1 | 偏均值回歸市場，適合均值回歸策略 |",
+    "| 半衰期 | 建議bar週期約為0.5~1倍半衰期 |",
+    "| 樣本外夏普比率 | 越高越好，表示策略穩定性 |",
+    "| 樣本外最大回撤 | 越低越好，表示風險控制 |",
+    "",
+)
+
+
 def generate_txt_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFrame) -> str:
     """
     生成TXT格式的詳細報告
@@ -639,14 +880,14 @@ def generate_txt_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFram
     report.append("-" * 40)
     report.append("")
     
-    # 創建已測試時間框架的集合
-    tested_timeframes = set(report_df['Timeframe'].tolist())
+    # 以時間框架為鍵的測試結果，避免每個時間框架都掃描一次 report_df
+    rows_by_tf = report_df.set_index('Timeframe', drop=False).to_dict('index')
     
     # 遍歷所有配置的時間框架
     for tf_label, rule in cfg.timeframes.items():
-        if tf_label in tested_timeframes:
+        if tf_label in rows_by_tf:
             # 找到對應的測試結果
-            row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            row = rows_by_tf[tf_label]
             report.append(f"🕐 {row['Timeframe']} 時間框架")
             report.append(f"    K線數量: {row['Bars']:,}")
             report.append(f"    平均ATR: {row['Avg_ATR_pct']:.4f} ({row['Avg_ATR_pct']*100:.2f}%)")
@@ -692,80 +933,7 @@ def generate_txt_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFram
         report.append(f"最高趨勢性時間框架: {best_vr['Timeframe']} (VR: {best_vr['VarianceRatio']:.4f})")
     
     report.append("")
-    report.append("📋 指標解讀指南:")
-    report.append("• C/A < 0.25: 成本相對於波動率較低，適合交易")
-    report.append("• VR > 1: 偏趨勢市場，適合趨勢策略")
-    report.append("• VR < 1: 偏均值回歸市場，適合均值回歸策略")
-    report.append("• 半衰期: 建議bar週期約為0.5~1倍半衰期")
-    report.append("• 波動率: 反映市場波動程度")
-    report.append("• 偏度: 正偏度表示右尾較長，負偏度表示左尾較長")
-    report.append("• 峰度: 高峰度表示極端值較多")
-    report.append("• 自相關: 正值表示趨勢性，負值表示均值回歸")
-    report.append("• 市場效率比率: 越接近1表示市場越有效率")
-    
-    # 添加詳細指標解釋
-    report.append("")
-    report.append("📊 詳細指標解釋")
-    report.append("-" * 40)
-    report.append("")
-    
-    report.append("🔍 成本/波動比 (C/A Ratio)")
-    report.append("意義: 衡量交易成本相對於市場波動的比率")
-    report.append("解讀: ")
-    report.append("• C/A < 0.25: 成本相對較低，適合頻繁交易")
-    report.append("• C/A 0.25-0.5: 成本適中，需要謹慎選擇入場點")
-    report.append("• C/A > 0.5: 成本過高，不適合短線交易")
-    report.append("")
-    
-    report.append("🔍 走勢一致性 (Variance Ratio, VR)")
-    report.append("意義: 衡量價格變動的趨勢性強度")
-    report.append("解讀:")
-    report.append("• VR > 1: 價格變動具有趨勢性，適合趨勢跟隨策略")
-    report.append("• VR < 1: 價格變動偏向隨機遊走，適合均值回歸策略")
-    report.append("• VR ≈ 1: 價格變動接近隨機遊走")
-    report.append("")
-    
-    report.append("🔍 訊號半衰期 (Signal Half-Life)")
-    report.append("意義: 衡量價格訊號的持續時間")
-    report.append("解讀:")
-    report.append("• 半衰期越長，訊號越持久，適合較長期的策略")
-    report.append("• 半衰期越短，訊號變化越快，需要更頻繁的調整")
-    report.append("")
-    
-    report.append("🔍 年化波動率 (Annualized Volatility)")
-    report.append("意義: 衡量價格變動的劇烈程度")
-    report.append("解讀:")
-    report.append("• 波動率越高，價格變動越劇烈，風險越大")
-    report.append("• 波動率越低，價格變動越平穩，風險較小")
-    report.append("")
-    
-    report.append("🔍 報酬偏度 (Return Skewness)")
-    report.append("意義: 衡量報酬分布的對稱性")
-    report.append("解讀:")
-    report.append("• 正偏度: 右尾較長，大幅上漲機率較高")
-    report.append("• 負偏度: 左尾較長，大幅下跌機率較高")
-    report.append("")
-    
-    report.append("🔍 報酬峰度 (Return Kurtosis)")
-    report.append("意義: 衡量報酬分布的尖銳程度")
-    report.append("解讀:")
-    report.append("• 高峰度: 極端值出現機率較高，風險較大")
-    report.append("• 低峰度: 分布較平坦，極端值較少")
-    report.append("")
-    
-    report.append("🔍 自相關 (Autocorrelation)")
-    report.append("意義: 衡量當前價格與過去價格的相關性")
-    report.append("解讀:")
-    report.append("• 正值: 價格具有趨勢性，過去走勢對未來有影響")
-    report.append("• 負值: 價格具有均值回歸特性")
-    report.append("")
-    
-    report.append("🔍 市場效率比率 (Market Efficiency Ratio)")
-    report.append("意義: 衡量市場的資訊效率")
-    report.append("解讀:")
-    report.append("• 接近1: 市場效率較高，價格充分反映資訊")
-    report.append("• 遠離1: 市場效率較低，可能存在套利機會")
-    report.append("")
+    report.extend(_TXT_INDICATOR_GUIDE)
     
     # 添加市場分析結論
     report.append("📈 市場分析結論")
@@ -799,8 +967,8 @@ def generate_txt_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFram
     long_term_timeframes = ['1d', '1w']
     long_term_skewness = []
     for tf in long_term_timeframes:
-        if tf in report_df['Timeframe'].values:
-            row = report_df[report_df['Timeframe'] == tf].iloc[0]
+        if tf in rows_by_tf:
+            row = rows_by_tf[tf]
             if 'Skewness' in row and not pd.isna(row['Skewness']):
                 long_term_skewness.append(row['Skewness'])
     
@@ -834,11 +1002,7 @@ def generate_txt_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFram
         report.append(f"3. 長線交易({', '.join(long_timeframes)}): 最適合，成本效率最佳，適合趨勢跟隨策略")
     
     report.append("")
-    report.append("🎯 風險管理建議:")
-    report.append("1. 由於高波動性，建議使用較小的倉位規模")
-    report.append("2. 設置適當的止損位，避免極端價格變動造成的損失")
-    report.append("3. 考慮使用期權等衍生品進行風險對沖")
-    report.append("4. 關注市場情緒指標，避免在極端市場條件下交易")
+    report.extend(_TXT_RISK_ADVICE)
     
     report.append("")
     report.append("🎯 最佳時間框架選擇:")
@@ -916,8 +1080,8 @@ def generate_md_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFrame
     report.append("## 📈 時間框架分析結果")
     report.append("")
     
-    # 創建已測試時間框架的集合
-    tested_timeframes = set(report_df['Timeframe'].tolist())
+    # 以時間框架為鍵的測試結果，避免每個時間框架都掃描一次 report_df
+    rows_by_tf = report_df.set_index('Timeframe', drop=False).to_dict('index')
     
     # 建立結果表格
     table_headers = ["時間框架", "K線數", "C/A", "VR", "半衰期", "波動率", "偏度", "峰度", "自相關", "市場效率", "通過C/A測試", "狀態"]
@@ -926,9 +1090,9 @@ def generate_md_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFrame
     
     # 遍歷所有配置的時間框架
     for tf_label, rule in cfg.timeframes.items():
-        if tf_label in tested_timeframes:
+        if tf_label in rows_by_tf:
             # 找到對應的測試結果
-            row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            row = rows_by_tf[tf_label]
             volatility = f"{row['Volatility_Ann']:.4f}" if 'Volatility_Ann' in row and not pd.isna(row['Volatility_Ann']) else "N/A"
             skewness = f"{row['Skewness']:.4f}" if 'Skewness' in row and not pd.isna(row['Skewness']) else "N/A"
             kurtosis = f"{row['Kurtosis']:.4f}" if 'Kurtosis' in row and not pd.isna(row['Kurtosis']) else "N/A"
@@ -976,9 +1140,9 @@ def generate_md_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFrame
     
     # 遍歷所有配置的時間框架
     for tf_label, rule in cfg.timeframes.items():
-        if tf_label in tested_timeframes:
+        if tf_label in rows_by_tf:
             # 找到對應的測試結果
-            row = report_df[report_df['Timeframe'] == tf_label].iloc[0]
+            row = rows_by_tf[tf_label]
             report.append(f"#### 🕐 {row['Timeframe']} 時間框架")
             report.append("")
             report.append(f"**基本統計:**")
@@ -1028,27 +1192,17 @@ def generate_md_report(report_df: pd.DataFrame, cfg: Config, df_1m: pd.DataFrame
     report.append("")
     
     # 找出最佳時間框架
-            best_ca = report_df.loc[report_df['C_over_A'].idxmin()] if 'C_over_A' in report_df.columns else None
-        best_vr = report_df.loc[report_df['VarianceRatio'].idxmax()] if 'VarianceRatio' in report_df.columns else None
-        
-        if best_ca is not None and not pd.isna(best_ca['C_over_A']):
-            report.append(f"**最佳成本效率時間框架:** {best_ca['Timeframe']} (C/A: {best_ca['C_over_A']:.4f})")
-        
-        if best_vr is not None and not pd.isna(best_vr['VarianceRatio']):
-            report.append(f"**最高趨勢性時間框架:** {best_vr['Timeframe']} (VR: {best_vr['VarianceRatio']:.4f})")
+    best_ca = report_df.loc[report_df['C_over_A'].idxmin()] if 'C_over_A' in report_df.columns else None
+    best_vr = report_df.loc[report_df['VarianceRatio'].idxmax()] if 'VarianceRatio' in report_df.columns else None
+    
+    if best_ca is not None and not pd.isna(best_ca['C_over_A']):
+        report.append(f"**最佳成本效率時間框架:** {best_ca['Timeframe']} (C/A: {best_ca['C_over_A']:.4f})")
+    
+    if best_vr is not None and not pd.isna(best_vr['VarianceRatio']):
+        report.append(f"**最高趨勢性時間框架:** {best_vr['Timeframe']} (VR: {best_vr['VarianceRatio']:.4f})")
     
     report.append("")
-    report.append("### 📋 指標解讀指南")
-    report.append("")
-    report.append("| 指標 | 解讀 |")
-    report.append("|------|------|")
-    report.append("| C/A < 0.25 | 成本相對於波動率較低，適合交易 |")
-    report.append("| VR > 1 | 偏趨勢市場，適合趨勢策略 |")
-    report.append("| VR < 1 | 偏均值回歸市場，適合均值回歸策略 |")
-    report.append("| 半衰期 | 建議bar週期約為0.5~1倍半衰期 |")
-    report.append("| 樣本外夏普比率 | 越高越好，表示策略穩定性 |")
-    report.append("| 樣本外最大回撤 | 越低越好，表示風險控制 |")
-    report.append("")
+    report.extend(_MD_INDICATOR_GUIDE)
     
     return "\n".join(report)
 
@@ -1082,20 +1236,99 @@ def detect_columns(df: pd.DataFrame, cfg: Config) -> Dict[str, str]:
     return mapping
 
 
+# load_1m_csv 解析結果快取；檔案 mtime/大小或欄位、時區設定改變時鍵值不同，自動失效
+_FRAME_CACHE: "OrderedDict[Tuple, pd.DataFrame]" = OrderedDict()
+_FRAME_CACHE_SIZE = 4
+
+
 def load_1m_csv(path: str, cfg: Config) -> pd.DataFrame:
-    """讀取 1m CSV，標準化欄位，設定為時序索引（UTC）。"""
-    df = pd.read_csv(path)
+    """讀取 1m CSV（或 Parquet），同一檔案未變更時重用解析結果。"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size,
+           cfg.ts_col, cfg.open_col, cfg.high_col, cfg.low_col, cfg.close_col, cfg.vol_col,
+           str(cfg.tz))
+    df = _FRAME_CACHE.get(key)
+    if df is None:
+        df = _load_with_sidecar(path, cfg, key[3:], st.st_mtime_ns, st.st_size)
+        _FRAME_CACHE[key] = df
+        if len(_FRAME_CACHE) > _FRAME_CACHE_SIZE:
+            _FRAME_CACHE.popitem(last=False)
+    else:
+        _FRAME_CACHE.move_to_end(key)
+    # 回傳副本，呼叫端修改不會影響快取
+    return df.copy()
+
+
+def _load_with_sidecar(path: str, cfg: Config, settings: Tuple, mtime_ns: int, size: int) -> pd.DataFrame:
+    """cfg.csv_sidecar 啟用時，CSV 解析結果另存為 Parquet 副檔（需安裝 pyarrow）
+
+    副檔的 metadata 記錄來源 CSV 的 mtime、大小與解析設定，三者皆相符時才直接讀取。
+    """
+    if not cfg.csv_sidecar or not HAS_PYARROW or path.endswith('.parquet'):
+        return _parse_1m_file(path, cfg)
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sidecar = path + ".parquet"
+    source = json.dumps({"mtime_ns": mtime_ns, "size": size, "settings": list(settings)}).encode()
+    try:
+        metadata = pq.read_schema(sidecar).metadata or {}
+        if metadata.get(b"source") == source:
+            df = pq.read_table(sidecar).to_pandas()
+            # Parquet 不支援秒精度，還原解析時的時間單位（pandas 2.0 以前索引一律為奈秒）
+            if hasattr(df.index, "as_unit"):
+                df.index = df.index.as_unit(metadata[b"index_unit"].decode())
+            return df
+    except (OSError, ValueError, pa.ArrowException):
+        pass  # 副檔不存在或損毀時重新解析
+
+    df = _parse_1m_file(path, cfg)
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        table = pa.Table.from_pandas(df)
+        unit = getattr(df.index, "unit", "ns")
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"source": source,
+                                             b"index_unit": unit.encode()})
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, sidecar)
+    except (OSError, pa.ArrowException) as e:
+        print(f"無法寫入解析快取 {sidecar}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass  # 暫存檔未建立
+    return df
+
+
+def _parse_1m_file(path: str, cfg: Config) -> pd.DataFrame:
+    """讀取 1m CSV（或 Parquet），標準化欄位，設定為時序索引（UTC）。"""
+    if path.endswith('.parquet'):
+        # Parquet 保留時間索引與數值型別，還原成欄位後走相同的標準化流程
+        df = pd.read_parquet(path).reset_index()
+    else:
+        df = pd.read_csv(path, engine=CSV_ENGINE)
+    # 欄位對映只解析一次，之後直接使用實際欄名
     mapping = detect_columns(df, cfg)
+    ts_col, open_col, high_col, low_col, close_col, vol_col = (
+        mapping[k] for k in ('ts', 'open', 'high', 'low', 'close', 'vol'))
 
-    ts = pd.to_datetime(df[mapping['ts']], unit='ms', errors='coerce')
-    if ts.isna().mean() > 0.5:
-        # 多半代表不是毫秒，改用自然解析
-        ts = pd.to_datetime(df[mapping['ts']], errors='coerce')
+    raw_ts = df[ts_col]
+    if pd.api.types.is_datetime64_any_dtype(raw_ts):
+        ts = raw_ts
+    else:
+        # 直接解析成 UTC，省去之後的 tz_localize
+        ts = pd.to_datetime(raw_ts, unit='ms', errors='coerce', utc=True)
+        if ts.isna().mean() > 0.5:
+            # 多半代表不是毫秒，改用自然解析
+            ts = pd.to_datetime(raw_ts, errors='coerce', utc=True)
 
     if ts.isna().any():
-        df = df.loc[~ts.isna()].copy()
-        ts = pd.to_datetime(df[mapping['ts']], errors='coerce')
-        if ts.isna().any():
+        # 丟棄無法解析的時間列，沿用同一次解析結果
+        valid = ts.notna().to_numpy()
+        df = df.loc[valid]
+        ts = ts[valid]
+        if ts.empty:
             raise ValueError("timestamp 欄位解析失敗，請確認格式。")
 
     # 處理時區
@@ -1104,21 +1337,23 @@ def load_1m_csv(path: str, cfg: Config) -> pd.DataFrame:
     else:
         ts = ts.dt.tz_convert('UTC')
     
-    # 轉換到目標時區
-    import pytz
-    target_tz = pytz.timezone(cfg.tz) if isinstance(cfg.tz, str) else cfg.tz
-    ts = ts.dt.tz_convert(target_tz)
+    # 轉換到目標時區（字串交由 pandas 解析，時區物件由其內部快取）；目標為 UTC 時不必轉換
+    if str(cfg.tz) != 'UTC':
+        ts = ts.dt.tz_convert(cfg.tz)
     
     df = df.assign(
         timestamp=ts,
-        open=df[mapping['open']].astype(float),
-        high=df[mapping['high']].astype(float),
-        low=df[mapping['low']].astype(float),
-        close=df[mapping['close']].astype(float),
-        volume=df[mapping['vol']].astype(float) if mapping['vol'] is not None else np.nan,
+        open=df[open_col].astype(float),
+        high=df[high_col].astype(float),
+        low=df[low_col].astype(float),
+        close=df[close_col].astype(float),
+        volume=df[vol_col].astype(float) if vol_col is not None else np.nan,
     ).dropna(subset=['open', 'high', 'low', 'close'])
 
-    df = df.drop_duplicates(subset=['timestamp']).set_index('timestamp').sort_index()
+    df = df[~df['timestamp'].duplicated()].set_index('timestamp')
+    # Binance 資料通常已依時間排序，先以 O(N) 檢查避免不必要的排序
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
     # 嘗試補齊缺漏分鐘（可選）
     # all_minutes = pd.date_range(df.index.min(), df.index.max(), freq='1T', tz=cfg.tz)
     # df = df.reindex(all_minutes).ffill()
@@ -1127,6 +1362,14 @@ def load_1m_csv(path: str, cfg: Config) -> pd.DataFrame:
 
 def resample_ohlcv(df_1m: pd.DataFrame, rule: str) -> pd.DataFrame:
     """以 OHLCV 規則重採樣。"""
+    if to_offset(rule) == _SOURCE_OFFSET and _is_clean_minute_index(df_1m.index):
+        # 規則等於來源頻率時，右閉右標籤的重採樣只會去掉空 bar，直接取原資料；
+        # 成交量與 sum 聚合一致，NaN 視為 0
+        ohlcv = df_1m[['open', 'high', 'low', 'close', 'volume']].dropna(subset=['open', 'high', 'low', 'close'])
+        return ohlcv.fillna({'volume': 0.0})
+    fast = _resample_ohlcv_reduceat(df_1m, rule)
+    if fast is not None:
+        return fast
     agg = {
         'open': 'first',
         'high': 'max',
@@ -1137,75 +1380,245 @@ def resample_ohlcv(df_1m: pd.DataFrame, rule: str) -> pd.DataFrame:
     return df_1m.resample(rule, label='right', closed='right').agg(agg).dropna(subset=['open', 'high', 'low', 'close'])
 
 
+def _resample_ohlcv_reduceat(df: pd.DataFrame, rule: str) -> Optional[pd.DataFrame]:
+    """固定長度規則在已排序 UTC 索引上以 reduceat 分桶聚合；條件不符時回傳 None 交給 resample。
+
+    bar 長度須整除一天，分桶邊界才會與 resample 以午夜為原點的邊界一致。
+    """
+    span = _fixed_span(rule)
+    index = df.index
+    if (span is None or pd.Timedelta(days=1) % span or len(index) == 0
+            or str(index.tz) != 'UTC' or not index.is_monotonic_increasing):
+        return None
+    prices = df[['open', 'high', 'low', 'close']].to_numpy(dtype=np.float64)
+    if np.isnan(prices).any():
+        return None  # first/last 需跳過 NaN 時交給 pandas
+
+    ts = index.values  # UTC 的 datetime64，單位沿用索引
+    unit = np.datetime_data(ts.dtype)[0]
+    step = int(np.timedelta64(span.value, 'ns') // np.timedelta64(1, unit))
+    # 右閉右標籤：(label - span, label]，即時間向上取整到 span 的倍數
+    bucket = -(-ts.view('i8') // step)
+    starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+    ends = np.append(starts[1:], len(bucket)) - 1
+
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    labels = pd.DatetimeIndex((bucket[starts] * step).astype(ts.dtype), name=index.name).tz_localize('UTC')
+    return pd.DataFrame({
+        'open': prices[starts, 0],
+        'high': np.maximum.reduceat(prices[:, 1], starts),
+        'low': np.minimum.reduceat(prices[:, 2], starts),
+        'close': prices[ends, 3],
+        'volume': np.add.reduceat(np.where(np.isnan(volume), 0.0, volume), starts),
+    }, index=labels)
+
+
+def resample_cache_key(df_1m: pd.DataFrame, cfg: Config) -> Optional[str]:
+    """重採樣快取鍵的前綴 (交易對, 資料範圍, 內容校驗和)；每次執行只需計算一次
+
+    未設定快取目錄、未安裝 pyarrow 或資料為空時回傳 None（不使用快取）。
+    """
+    if not cfg.resample_cache_dir or not HAS_PYARROW or df_1m.empty:
+        return None
+    checksum = float(np.nansum(df_1m[['open', 'high', 'low', 'close', 'volume']].to_numpy()))
+    return f"{cfg.symbol}|{df_1m.index[0]}|{df_1m.index[-1]}|{len(df_1m)}|{checksum!r}"
+
+
+def resample_ohlcv_cached(df_1m: pd.DataFrame, rule: str, cfg: Config,
+                          source: Optional[pd.DataFrame] = None,
+                          cache_key: Optional[str] = None) -> pd.DataFrame:
+    """重採樣並以 Parquet 快取到本地，cache_key 為 resample_cache_key 的結果（None 表示不快取）
+
+    source 為由 df_1m 重採樣出的較細週期資料時，直接由其聚合（結果相同、資料量較小）。
+    1 分鐘規則只是原資料的複本，不寫入快取。
+    """
+    if source is None:
+        source = df_1m
+    if cache_key is None or _fixed_span(rule) == pd.Timedelta(minutes=1):
+        return resample_ohlcv(source, rule)
+
+    path = os.path.join(cfg.resample_cache_dir,
+                        hashlib.sha256(f"{cache_key}|{rule}".encode()).hexdigest() + ".parquet")
+    try:
+        ohlc = pd.read_parquet(path)
+        os.utime(path)  # 更新存取時間供 LRU 淘汰
+        return ohlc
+    except (OSError, ValueError):
+        pass  # 尚未快取、快取損毀或剛被淘汰時重新計算
+
+    ohlc = resample_ohlcv(source, rule)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cfg.resample_cache_dir, exist_ok=True)
+        ohlc.to_parquet(tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"無法寫入重採樣快取 {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass  # 暫存檔未建立
+    return ohlc
+
+
+def _fixed_span(rule: str) -> Optional[pd.Timedelta]:
+    """固定長度規則（分、時、日）的 bar 長度；週、月等曆法規則回傳 None"""
+    offset = to_offset(rule)
+    if isinstance(offset, pd.offsets.Day):
+        return pd.Timedelta(days=offset.n)
+    if isinstance(offset, pd.offsets.Tick):
+        return pd.Timedelta(offset)
+    return None
+
+
+def _can_cascade(fine_rule: str, coarse_rule: str) -> bool:
+    """coarse 的每根 bar 是否恰由整數根 fine bar 組成（右閉右標籤、以午夜對齊）
+
+    週線等曆法規則在 closed='right' 時邊界會延到當日結束，與固定長度的 bar 不對齊，一律不接續。
+    """
+    day = pd.Timedelta(days=1)
+    fine = _fixed_span(fine_rule)
+    coarse = _fixed_span(coarse_rule)
+    if fine is None or coarse is None:
+        return False
+    return coarse > fine and not coarse % fine and not day % coarse
+
+
+def pick_resample_source(df_1m: pd.DataFrame, rule: str,
+                         resampled: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """從已重採樣的結果中挑出可整除 rule 的最粗週期作為來源，否則回傳 df_1m。
+
+    OHLCV 聚合可分段進行（first/max/min/last/sum），例如 15min 可由 5min 再聚合。
+    僅在 UTC 索引下使用，避免日光節約時間造成日界不等長。
+    """
+    if str(df_1m.index.tz) != 'UTC':
+        return df_1m
+    best_rule = _best_cascade_rule(rule, resampled)
+    return resampled[best_rule] if best_rule is not None else df_1m
+
+
+def _best_cascade_rule(rule: str, candidates) -> Optional[str]:
+    """candidates 中可整除 rule 的最粗週期規則，沒有則回傳 None"""
+    best_rule = None
+    for fine_rule in candidates:
+        if _can_cascade(fine_rule, rule) and (
+                best_rule is None or _fixed_span(fine_rule) > _fixed_span(best_rule)):
+            best_rule = fine_rule
+    return best_rule
+
+
+def last_cascade_use(rules: List[str]) -> Dict[str, int]:
+    """依序重採樣 rules 時，各規則最後一次被 pick_resample_source 選為來源的位置"""
+    last_use = {}
+    for i, rule in enumerate(rules):
+        best_rule = _best_cascade_rule(rule, rules[:i])
+        if best_rule is not None:
+            last_use[best_rule] = i
+    return last_use
+
+
+def _is_clean_minute_index(index: pd.DatetimeIndex) -> bool:
+    """索引遞增、無重複且都落在整分鐘上"""
+    if not (index.is_monotonic_increasing and index.is_unique):
+        return False
+    values = index.values
+    return bool((values.astype('datetime64[m]') == values).all())
+
+
 def compute_atr(df: pd.DataFrame, period: int) -> pd.Series:
     """簡易 ATR（SMA 版）。"""
-    high = df['high']
-    low = df['low']
-    close = df['close']
-    prev_close = close.shift(1)
+    high = df['high'].to_numpy(dtype=np.float64)
+    low = df['low'].to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
 
-    tr = pd.concat([
-        (high - low),
-        (high - prev_close).abs(),
-        (low - prev_close).abs()
-    ], axis=1).max(axis=1)
+    # fmax 忽略 NaN，第一根 bar 沒有前收盤價時 TR 即為 high - low
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
 
-    atr = tr.rolling(period).mean()
-    return atr
+    # 以卷積計算 SMA，前 period-1 根不足一個視窗補 NaN（與 rolling(period).mean() 一致）
+    atr = np.full(len(tr), np.nan)
+    if 0 < period <= len(tr):
+        atr[period - 1:] = np.convolve(tr, np.ones(period) / period, mode='valid')
+    return pd.Series(atr, index=df.index)
 
 
-def variance_ratio(returns: pd.Series, q: int) -> float:
-    """計算 Lo-MacKinlay 型的簡化 Variance Ratio。"""
-    r = returns.dropna()
+def variance_ratio(returns: Union[pd.Series, np.ndarray], q: int) -> float:
+    """計算 Lo-MacKinlay 型的簡化 Variance Ratio（可直接傳入 ndarray）。"""
+    r = np.asarray(returns, dtype=np.float64)
+    r = r[~np.isnan(r)]
     if len(r) < q + 2:
         return np.nan
     var_1 = np.var(r, ddof=1)
-    r_q = r.rolling(q).sum()
-    var_q = np.var(r_q.dropna(), ddof=1)
+    # q 期滾動加總以累積和相減取得，避免 rolling 視窗運算
+    cs = np.cumsum(r)
+    r_q = cs[q - 1:] - np.concatenate(([0.0], cs[:-q]))
+    var_q = np.var(r_q, ddof=1)
     if var_1 == 0:
         return np.nan
     return float(var_q / (q * var_1))
 
 
-def estimate_half_life_by_autocorr(returns: pd.Series, max_lag: int) -> Optional[float]:
+# 半衰期掃描中直接以內積計算的 lag 數，超過後改用 FFT
+# （一次 FFT 約相當於數百次長度 N 的內積，max_lag 很大時才划算）
+_HALF_LIFE_DIRECT_LAGS = 512
+
+
+def estimate_half_life_by_autocorr(returns: Union[pd.Series, np.ndarray], max_lag: int) -> Optional[float]:
     """
     用報酬自相關的衰減來近似「訊號半衰期」：
     找出 lag=1 的自相關 rho1，往後尋找第一個 lag=k 使得 |rho_k| <= 0.5*|rho1|。
     回傳 k（單位：bar）。若 rho1 無意義或找不到，回傳 None。
     """
-    r = returns.dropna()
+    r = np.asarray(returns, dtype=np.float64)
+    r = r[~np.isnan(r)]
     if len(r) < max_lag + 5:
         return None
 
     r = r - r.mean()
-    var = (r ** 2).sum()
+    var = float(np.dot(r, r))
     if var == 0:
         return None
 
     def autocorr(lag: int) -> float:
-        return float((r[lag:] * r.shift(lag)[lag:]).sum() / var)
+        # 直接在連續陣列上做內積，不建立 shift 後的 Series
+        return float(np.dot(r[lag:], r[:-lag]) / var)
 
     rho1 = autocorr(1)
     if np.isnan(rho1) or abs(rho1) < 1e-6:
         return None
 
     target = 0.5 * abs(rho1)
-    for k in range(2, max_lag + 1):
+    # 前段 lag 逐一內積（多數序列在此即提前結束）
+    direct_max = min(max_lag, _HALF_LIFE_DIRECT_LAGS)
+    for k in range(2, direct_max + 1):
         rhok = autocorr(k)
         if np.isnan(rhok):
             continue
         if abs(rhok) <= target:
             return float(k)
+
+    # 剩餘的 lag 以一次 FFT 求出全部自相關，O(N log N) 取代 O(N * max_lag)
+    if max_lag > direct_max:
+        acf = _autocovariance_fft(r, max_lag) / var
+        for k in range(direct_max + 1, max_lag + 1):
+            rhok = acf[k]
+            if np.isnan(rhok):
+                continue
+            if abs(rhok) <= target:
+                return float(k)
     return None
 
 
+def _autocovariance_fft(r: np.ndarray, max_lag: int) -> np.ndarray:
+    """以 FFT 計算已去均值序列在 lag 0..max_lag 的未正規化自共變異數（sum r[t]*r[t-k]）"""
+    n = len(r)
+    f = np.fft.rfft(r, n=2 * n)  # 補零到 2N 避免循環相關
+    return np.fft.irfft(f * np.conj(f), n=2 * n)[:max_lag + 1]
+
+
+@functools.lru_cache(maxsize=None)
 def bar_minutes(label: str) -> float:
-    mapping = {
-        "1m": 1, "5m": 5, "15m": 15,
-        "1h": 60, "4h": 240,
-        "1d": 1440, "1w": 10080
-    }
-    return float(mapping.get(label, 1.0))
+    return float(TIMEFRAME_MINUTES.get(label, 1.0))
 
 
 def get_min_bars_for_timeframe(tf_label: str, cfg: Config) -> int:
@@ -1223,8 +1636,12 @@ def get_min_bars_for_timeframe(tf_label: str, cfg: Config) -> int:
         return cfg.n_min_bars_for_backtest
     
     # 獲取該時間框架的最小天數要求
-    min_days = cfg.min_days_per_timeframe.get(tf_label, 365)
-    
+    return _min_bars_for_days(tf_label, cfg.min_days_per_timeframe.get(tf_label, 365))
+
+
+@functools.lru_cache(maxsize=None)
+def _min_bars_for_days(tf_label: str, min_days: int) -> int:
+    """以最小天數換算該時間框架的最小K線數量"""
     # 計算該時間框架每根K線的分鐘數
     minutes_per_bar = bar_minutes(tf_label)
     
@@ -1237,6 +1654,7 @@ def get_min_bars_for_timeframe(tf_label: str, cfg: Config) -> int:
     return min_bars
 
 
+@functools.lru_cache(maxsize=None)
 def annualization_factor(tf_label: str) -> float:
     """以 365*24*60 分鐘/年 換算每個 bar 的年化倍數。"""
     bars_per_year = (365.0 * 24.0 * 60.0) / bar_minutes(tf_label)
@@ -1247,78 +1665,149 @@ def annualization_factor(tf_label: str) -> float:
 # ====== 技術指標計算 =======
 # =======================
 
-def calculate_volatility(returns: pd.Series, ann_factor: float) -> float:
-    """計算年化波動率"""
-    r = returns.dropna()
-    if len(r) < 2:
-        return np.nan
-    return float(r.std(ddof=1) * math.sqrt(ann_factor))
+def calculate_return_statistics(returns: pd.Series, ann_factor: float) -> Dict[str, float]:
+    """單次 dropna 後一併計算波動率、偏度、峰度、一階自相關與市場效率比率。
 
+    偏度、峰度與自相關與 pandas 的 skew / kurt / autocorr(lag=1) 相同；
+    市場效率比率為 2 期加總報酬的變異數除以 2 倍單期變異數。
+    """
+    r = returns.to_numpy(dtype=np.float64)
+    r = r[~np.isnan(r)]
+    n = len(r)
+    stats = {
+        "volatility": np.nan,
+        "skewness": np.nan,
+        "kurtosis": np.nan,
+        "autocorr_1": np.nan,
+        "market_efficiency": np.nan,
+    }
+    if n < 2:
+        return stats
+
+    # 中心化後的二、三、四階動差（與 pandas 偏度/峰度的偏差修正公式一致）
+    constant = r.max() == r.min()
+    d = r - r.mean()
+    d2 = d * d
+    m2 = d2.sum()
+    var = m2 / (n - 1)
+    stats["volatility"] = float(math.sqrt(var) * math.sqrt(ann_factor))
+
+    if n >= 3:
+        if constant:
+            stats["skewness"] = 0.0
+        else:
+            m3 = (d2 * d).sum()
+            stats["skewness"] = float(
+                math.sqrt(n * (n - 1)) / (n - 2) * (m3 / n) / (m2 / n) ** 1.5
+            )
+    if n >= 4:
+        if constant:
+            stats["kurtosis"] = 0.0
+        else:
+            m4 = (d2 * d2).sum()
+            adj = 3.0 * (n - 1) ** 2 / ((n - 2) * (n - 3))
+            stats["kurtosis"] = float(
+                n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 * m2) - adj
+            )
 
-def calculate_skewness(returns: pd.Series) -> float:
-    """計算報酬偏度"""
-    r = returns.dropna()
-    if len(r) < 3:
-        return np.nan
-    return float(r.skew())
+    # 一階自相關：r[t] 與 r[t-1] 的皮爾森相關係數
+    x, y = r[1:], r[:-1]
+    if len(x) >= 2 and not constant:
+        dx, dy = x - x.mean(), y - y.mean()
+        denom = math.sqrt(np.dot(dx, dx) * np.dot(dy, dy))
+        if denom > 0:
+            stats["autocorr_1"] = float(np.dot(dx, dy) / denom)
 
+    # 市場效率比率：兩期報酬和的方差 / (2 * 單期方差)
+    if n >= 10 and not constant:
+        stats["market_efficiency"] = float((x + y).var(ddof=1) / (2 * var))
 
-def calculate_kurtosis(returns: pd.Series) -> float:
-    """計算報酬峰度"""
-    r = returns.dropna()
-    if len(r) < 4:
-        return np.nan
-    return float(r.kurtosis())
+    return stats
 
 
-def calculate_autocorrelation(returns: pd.Series, lag: int = 1) -> float:
-    """計算報酬自相關"""
-    r = returns.dropna()
-    if len(r) < lag + 1:
-        return np.nan
-    return float(r.autocorr(lag=lag))
+# =======================
+# ====== PIPELINE =======
+# =======================
 
+def analyze_timeframe(tf_label: str, ohlc: pd.DataFrame, cfg: Config, cost_one_way: float) -> dict:
+    """計算單一時間框架的 C/A、VR、半衰期與報酬統計，回傳報告列。"""
+    ann_factor = annualization_factor(tf_label)
+    close = ohlc['close'].astype(np.float64)  # 報酬需要 float64 精度，float32 價格的差分誤差過大
+
+    # C/A
+    atr = compute_atr(ohlc, cfg.atr_period)
+    atr_pct = (atr / close).dropna()
+    avg_atr_pct = float(atr_pct.mean()) if len(atr_pct) else np.nan
+    cost_roundtrip = 2.0 * cost_one_way
+    c_over_a = float(cost_roundtrip / avg_atr_pct) if avg_atr_pct and avg_atr_pct > 0 else np.nan
+
+    # VR
+    ret = close.pct_change()
+    log_ret = np.diff(np.log(close.to_numpy()))  # 對數報酬（ndarray），VR 與半衰期共用
+    vr = variance_ratio(log_ret, cfg.vr_q)
+
+    # 半衰期（報酬自相關近似）
+    hl = estimate_half_life_by_autocorr(log_ret, cfg.half_life_max_lag)
+
+    # 計算額外的技術指標
+    ret_stats = calculate_return_statistics(ret, ann_factor)
+
+    row = {
+        "Timeframe": tf_label,
+        "Bars": len(ohlc),
+        "Avg_ATR_pct": avg_atr_pct,
+        "Cost_RoundTrip_pct": cost_roundtrip,
+        "C_over_A": c_over_a,
+        "VR_q": cfg.vr_q,
+        "VarianceRatio": vr,
+        "HalfLife_bars": hl,
+        "Volatility_Ann": ret_stats["volatility"],
+        "Skewness": ret_stats["skewness"],
+        "Kurtosis": ret_stats["kurtosis"],
+        "Autocorr_Lag1": ret_stats["autocorr_1"],
+        "Market_Efficiency": ret_stats["market_efficiency"],
+    }
 
-def calculate_market_efficiency_ratio(returns: pd.Series) -> float:
-    """計算市場效率比率（基於方差比）"""
-    r = returns.dropna()
-    if len(r) < 10:
-        return np.nan
-    
-    # 計算不同時間間隔的方差比
-    var_1 = r.var()
-    var_2 = r.rolling(2).sum().dropna().var()
-    
-    if var_1 == 0:
-        return np.nan
-    
-    return float(var_2 / (2 * var_1))
+    # 簡單可行性標記
+    row["Pass_CA_0.25"] = (c_over_a < 0.25) if not (pd.isna(c_over_a)) else False
 
+    return row
 
-# =======================
-# ====== PIPELINE =======
-# =======================
 
 def main(cfg: Config):
     print("=== 時間框架選擇工具 ===")
     
     try:
-        df_1m = smart_data_loader(cfg)
-        print(generate_data_report(df_1m, cfg))
+        df_1m, quality_report = smart_data_loader_with_report(cfg)
+        print(generate_data_report(df_1m, cfg, quality_report))
     except Exception as e:
         print("資料載入失敗：", e)
         print("請確認網路連線或檢查 CSV 路徑與欄位。")
         return
 
-    report_rows = []
+    jobs = []
+    resampled = {}  # 規則 -> 重採樣結果，供較粗週期接續聚合
+    cache_key = resample_cache_key(df_1m, cfg)
 
     # 成本（單邊）
     cost_one_way = (cfg.taker_fee if cfg.use_taker else cfg.maker_fee) + cfg.slippage_bps / 10000.0
     print(f"採用 {'吃單' if cfg.use_taker else '掛單'} 費率；單邊成本 = {cost_one_way:.6f} ({cost_one_way*100:.4f}%)")
 
-    for tf_label, rule in cfg.timeframes.items():
+    # float32 模式下只保留之後仍會作為接續來源的 float64 結果，其餘立即釋放，不與 float32 副本並存
+    last_use = last_cascade_use(list(cfg.timeframes.values())) if cfg.ohlcv_float32 else None
+
+    for i, (tf_label, rule) in enumerate(cfg.timeframes.items()):
         print(f"\n--- 時間框架：{tf_label} ({rule}) ---")
-        ohlc = resample_ohlcv(df_1m, rule)
+        ohlc = resample_ohlcv_cached(df_1m, rule, cfg, pick_resample_source(df_1m, rule, resampled),
+                                     cache_key)
+        if last_use is None:
+            resampled[rule] = ohlc
+        else:
+            if last_use.get(rule, -1) > i:
+                resampled[rule] = ohlc
+            for done_rule in [r for r in resampled if last_use[r] <= i]:
+                del resampled[done_rule]
+            ohlc = ohlc.astype(np.float32)
         
         # 動態計算該時間框架的最小資料量要求
         min_bars_required = get_min_bars_for_timeframe(tf_label, cfg)
@@ -1330,49 +1819,21 @@ def main(cfg: Config):
                 print(f"  該時間框架需要至少 {min_days_required} 天的資料")
             continue
 
-        ann_factor = annualization_factor(tf_label)
-
-        # C/A
-        atr = compute_atr(ohlc, cfg.atr_period)
-        atr_pct = (atr / ohlc['close']).dropna()
-        avg_atr_pct = float(atr_pct.mean()) if len(atr_pct) else np.nan
-        cost_roundtrip = 2.0 * cost_one_way
-        c_over_a = float(cost_roundtrip / avg_atr_pct) if avg_atr_pct and avg_atr_pct > 0 else np.nan
-
-        # VR
-        ret = ohlc['close'].pct_change()
-        vr = variance_ratio(np.log1p(ret), cfg.vr_q)
-
-        # 半衰期（報酬自相關近似）
-        hl = estimate_half_life_by_autocorr(np.log1p(ret), cfg.half_life_max_lag)
-
-        # 計算額外的技術指標
-        volatility = calculate_volatility(ret, ann_factor)
-        skewness = calculate_skewness(ret)
-        kurtosis = calculate_kurtosis(ret)
-        autocorr_1 = calculate_autocorrelation(ret, lag=1)
-        market_efficiency = calculate_market_efficiency_ratio(ret)
-
-        row = {
-            "Timeframe": tf_label,
-            "Bars": len(ohlc),
-            "Avg_ATR_pct": avg_atr_pct,
-            "Cost_RoundTrip_pct": cost_roundtrip,
-            "C_over_A": c_over_a,
-            "VR_q": cfg.vr_q,
-            "VarianceRatio": vr,
-            "HalfLife_bars": hl,
-            "Volatility_Ann": volatility,
-            "Skewness": skewness,
-            "Kurtosis": kurtosis,
-            "Autocorr_Lag1": autocorr_1,
-            "Market_Efficiency": market_efficiency,
-        }
+        jobs.append((tf_label, ohlc))
 
-        # 簡單可行性標記
-        row["Pass_CA_0.25"] = (c_over_a < 0.25) if not (pd.isna(c_over_a)) else False
+    if cache_key is not None:
+        prune_cache_dir(cfg.resample_cache_dir, cfg.resample_cache_max_mb * 1024 * 1024)
 
-        report_rows.append(row)
+    # 各時間框架的指標計算彼此獨立，可分散到多個行程
+    n_workers = min(cfg.analysis_workers, len(jobs))
+    labels = [tf_label for tf_label, _ in jobs]
+    frames = [ohlc for _, ohlc in jobs]
+    args = (labels, frames, [cfg] * len(jobs), [cost_one_way] * len(jobs))
+    if n_workers > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as ex:
+            report_rows = list(ex.map(analyze_timeframe, *args))
+    else:
+        report_rows = list(map(analyze_timeframe, *args))
 
     if not report_rows:
         print("沒有可用的時間框架結果。請確認資料量或調整最小資料量設定。")
@@ -1403,6 +1864,15 @@ def main(cfg: Config):
         report.to_csv(out_csv, index=False, encoding="utf-8-sig")
         print(f"\n✅ 已輸出CSV報表：{out_csv}")
     
+    # 生成Parquet報告（欄位型別完整保留，下游程式不必重新解析 CSV）
+    if cfg.generate_parquet_report:
+        out_parquet = f"./data/ethusdt_timeframe_report_{date_range}.parquet"
+        try:
+            report.to_parquet(out_parquet, index=False, compression='zstd')
+            print(f"✅ 已輸出Parquet報表：{out_parquet}")
+        except Exception as e:
+            print(f"輸出Parquet報表時發生錯誤: {e}")
+    
     # 生成TXT報告
     if cfg.generate_txt_report:
         txt_report = generate_txt_report(report, cfg, df_1m)